@@ -17,6 +17,8 @@ import sys
 import threading
 import time
 import webbrowser
+from functools import lru_cache
+from logging.handlers import QueueListener
 from pathlib import Path
 from urllib.parse import urlparse
 
@@ -60,7 +62,7 @@ from claude_tap.cursor_transcript import import_cursor_transcripts
 from claude_tap.forward_proxy import ForwardProxyServer
 from claude_tap.history import cleanup_trace_sessions, migrate_legacy_traces
 from claude_tap.live import LiveViewerServer
-from claude_tap.proxy import proxy_handler
+from claude_tap.proxy import create_upstream_session, proxy_handler
 from claude_tap.shared_dashboard import (
     DEFAULT_DASHBOARD_PORT,
     dashboard_url,
@@ -71,8 +73,9 @@ from claude_tap.shared_dashboard import (
     stop_incompatible_dashboard_if_running,
 )
 from claude_tap.trace import TraceWriter, create_trace_writer
-from claude_tap.trace_log_handler import SQLiteLogHandler
+from claude_tap.trace_log_handler import SQLiteLogHandler, start_queued_log_handler
 from claude_tap.trace_store import TraceStore, get_trace_store, resolve_db_path
+from claude_tap.version import CLAUDE_TAP_VERSION
 
 # Force UTF-8 + line-buffered stdout/stderr so emoji output works on Windows
 # consoles (GBK/cp936) and `uv tool` doesn't fully buffer our progress prints.
@@ -161,12 +164,8 @@ class _LazyTraceWriter:
         return self._writer
 
 
-try:
-    from importlib.metadata import version as _pkg_version
-
-    __version__ = _pkg_version("claude-tap")
-except Exception:
-    __version__ = "0.0.0"
+# Resolved once from package metadata in claude_tap.version.
+__version__ = CLAUDE_TAP_VERSION
 
 _CLI_COMPAT_EXPORTS = (
     shutil,
@@ -367,18 +366,20 @@ async def async_main(args: argparse.Namespace):
             print(f"⚠️  {exc}", file=sys.stderr)
 
     # Proxy logs go to SQLite, not terminal (avoids polluting Claude TUI)
-    sqlite_handler: SQLiteLogHandler | None = None
+    log_listener: QueueListener | None = None
+    log_queue_handler: logging.Handler | None = None
     if session_id is not None:
         sqlite_handler = SQLiteLogHandler(session_id, store=store)
         sqlite_handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", datefmt="%H:%M:%S"))
-        log.addHandler(sqlite_handler)
+        log_queue_handler, log_listener = start_queued_log_handler(sqlite_handler)
+        log.addHandler(log_queue_handler)
         log.setLevel(logging.DEBUG)
         logging.getLogger("aiohttp.access").setLevel(logging.WARNING)
         aiohttp_server_log = logging.getLogger("aiohttp.server")
-        aiohttp_server_log.addHandler(sqlite_handler)
+        aiohttp_server_log.addHandler(log_queue_handler)
         aiohttp_server_log.propagate = False
         asyncio_log = logging.getLogger("asyncio")
-        asyncio_log.addHandler(sqlite_handler)
+        asyncio_log.addHandler(log_queue_handler)
         asyncio_log.propagate = False
 
     # Proxy clients create this lazily.
@@ -405,7 +406,7 @@ async def async_main(args: argparse.Namespace):
         loopback_host = _loopback_target_host(args.target)
         if loopback_host is not None:
             _extend_no_proxy(os.environ, (loopback_host,))
-        session = aiohttp.ClientSession(auto_decompress=False, trust_env=True)
+        session = create_upstream_session()
 
         if args.proxy_mode == "forward":
             assert ca_cert_path is not None
@@ -482,8 +483,8 @@ async def async_main(args: argparse.Namespace):
         else:
             print("\n--no-launch mode: proxy running. Press Ctrl+C to stop.")
             try:
-                while True:
-                    await asyncio.sleep(3600)
+                # Park until cancelled (Ctrl+C); no periodic wakeups.
+                await asyncio.Event().wait()
             except asyncio.CancelledError:
                 pass
     finally:
@@ -517,6 +518,11 @@ async def async_main(args: argparse.Namespace):
         if writer is not None:
             writer.close()
 
+        if log_listener is not None:
+            log_listener.stop()
+            for logger in (log, logging.getLogger("aiohttp.server"), logging.getLogger("asyncio")):
+                logger.removeHandler(log_queue_handler)
+
         prompt_export_rc: int | None = None
         if args.export_prompt and session_id is not None:
             prompt_export_rc = _export_prompt_from_session(store, session_id, args.export_prompt)
@@ -605,13 +611,9 @@ def _prompt_trace_path(prompt_path: Path) -> Path:
     return prompt_path.with_name(f"{prompt_path.stem}.trace.jsonl")
 
 
-def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
-    """Parse argv, extracting ``--tap-*`` flags for ourselves and forwarding
-    everything else to the selected client.
-    """
-    if argv is None:
-        argv = sys.argv[1:]
-
+@lru_cache(maxsize=1)
+def _build_tap_parser() -> argparse.ArgumentParser:
+    """Build the ``--tap-*`` argument parser once; parsing does not mutate it."""
     tap_parser = argparse.ArgumentParser(
         prog="claude-tap",
         description=(
@@ -874,6 +876,17 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         dest="_deprecated_no_auto_update",
         help=argparse.SUPPRESS,
     )
+    return tap_parser
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parse argv, extracting ``--tap-*`` flags for ourselves and forwarding
+    everything else to the selected client.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    tap_parser = _build_tap_parser()
     args, claude_args = tap_parser.parse_known_args(argv)
     # Strip leading "--" separator if present (argparse leaves it in remainder)
     if claude_args and claude_args[0] == "--":
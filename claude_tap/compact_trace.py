@@ -7,6 +7,8 @@ from collections.abc import Callable
 from hashlib import sha256
 from typing import Any
 
+from claude_tap.json_codec import json_dumps, json_dumps_bytes
+
 COMPACT_TRACE_MARKER = "__claude_tap_compact_trace__"
 COMPACT_RECORD_MARKER = "__claude_tap_compact_record__"
 BLOB_REF_MARKER = "__claude_tap_blob_ref__"
@@ -28,7 +30,7 @@ COMPACT_ITEM_BLOB_PATHS = (
 
 def dump_compact_trace(records: list[dict[str, Any]]) -> str:
     """Serialize records into a portable compact trace bundle."""
-    return json.dumps(build_compact_trace_bundle(records), ensure_ascii=False, separators=(",", ":")) + "\n"
+    return json_dumps(build_compact_trace_bundle(records)) + "\n"
 
 
 def build_compact_trace_bundle(records: list[dict[str, Any]]) -> dict[str, Any]:
@@ -116,8 +118,8 @@ def make_blob_ref(hash_value: str, size_bytes: int) -> dict[str, Any]:
 
 
 def json_blob_payload(value: Any) -> tuple[str, int, str]:
-    payload_json = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
-    payload_bytes = payload_json.encode("utf-8")
+    payload_bytes = json_dumps_bytes(value)
+    payload_json = payload_bytes.decode("utf-8", errors="surrogatepass")
     return payload_json, len(payload_bytes), "sha256:" + sha256(payload_bytes).hexdigest()
 
 
@@ -6,11 +6,14 @@ import json
 import re
 import sqlite3
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 from urllib.parse import parse_qsl, urlencode, urlparse, urlsplit, urlunsplit
 
 from claude_tap.bedrock import bedrock_model_from_path
+from claude_tap.json_codec import json_dumps
+from claude_tap.trace import _MODEL_PROBE_PATH_RE
 from claude_tap.trace_store import SessionQuery, TraceStore, get_trace_store
 from claude_tap.usage import normalize_usage
 from claude_tap.viewer import _decode_bedrock_eventstream_events
@@ -53,11 +56,13 @@ _SENSITIVE_KEY_NAMES = {
     "xapikey",
 }
 _FORM_KEY_RE = re.compile(r"^[A-Za-z0-9_.\-\[\]]{1,128}$")
+_MODEL_PATH_RE = re.compile(r"/models?/([^:?/]+)")
 _MAX_TEXT_REDACTION_DEPTH = 8
 
 
+@lru_cache(maxsize=1)
 def read_dashboard_template() -> str:
-    """Read the packaged dashboard HTML."""
+    """Read the packaged dashboard HTML (once per process)."""
     return DASHBOARD_TEMPLATE_PATH.read_text(encoding="utf-8")
 
 
@@ -698,7 +703,7 @@ def _record_model(record: dict[str, Any]) -> str:
         bedrock_model = bedrock_model_from_path(path)
         if bedrock_model:
             return bedrock_model
-        match = re.search(r"/models?/([^:?/]+)", path)
+        match = _MODEL_PATH_RE.search(path)
         if match:
             return match.group(1)
     return ""
@@ -882,7 +887,7 @@ def _redact_sensitive_text(value: str, depth: int = 0) -> str:
         if parsed is not None:
             redacted = _redact_sensitive_value(parsed)
             if redacted != parsed:
-                return json.dumps(redacted, ensure_ascii=False, separators=(",", ":"))
+                return json_dumps(redacted)
     redacted_url = _redact_url_query(value, depth)
     if redacted_url is not None:
         return redacted_url
@@ -1012,10 +1017,7 @@ def _is_auxiliary_record(record: dict[str, Any]) -> bool:
 
 def _is_model_probe_path(path: str) -> bool:
     clean_path = path.split("?", 1)[0].rstrip("/")
-    if clean_path in {"/models", "/v1/models", "/v1alpha/models", "/v1beta/models"}:
-        return True
-    match = re.fullmatch(r"/(?:v1/)?models/([^/:]+)", clean_path)
-    return match is not None
+    return _MODEL_PROBE_PATH_RE.fullmatch(clean_path) is not None
 
 
 def _is_session_error_record(record: dict[str, Any]) -> bool:
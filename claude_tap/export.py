@@ -3,14 +3,14 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
 
 from claude_tap.compact_trace import build_compact_trace_bundle, dump_compact_trace, is_compact_trace_bundle
+from claude_tap.json_codec import json_dumps, json_dumps_indented, json_loads
 from claude_tap.prompt_snapshot import render_prompt_markdown, snapshot_from_records
 from claude_tap.usage import normalize_usage
-from claude_tap.viewer import _generate_html_viewer_from_compact_bundle, _normalize_record_for_viewer
+from claude_tap.viewer import _generate_html_viewer_from_compact_bundle, _normalize_record_dict_for_viewer
 
 
 def _as_dict(value: object) -> dict:
@@ -21,10 +21,14 @@ def _normalize_record_for_export(record: object) -> dict | None:
     if not isinstance(record, dict):
         return None
     try:
-        normalized = json.loads(_normalize_record_for_viewer(json.dumps(record, ensure_ascii=False)))
-    except (TypeError, json.JSONDecodeError):
+        # Round-trip once for a detached copy, then normalize it in place.
+        normalized = json_loads(json_dumps(record))
+    except (TypeError, ValueError):
         return record
-    return normalized if isinstance(normalized, dict) else record
+    if not isinstance(normalized, dict):
+        return record
+    _normalize_record_dict_for_viewer(normalized)
+    return normalized
 
 
 def _normalize_records_for_export(records: list[dict]) -> list[dict]:
@@ -55,8 +59,8 @@ def _turn_sort_key(record: dict) -> int:
 
 def _load_records_from_text(text: str) -> tuple[list[dict], dict | None]:
     try:
-        parsed = json.loads(text)
-    except json.JSONDecodeError:
+        parsed = json_loads(text)
+    except ValueError:
         parsed = None
     if is_compact_trace_bundle(parsed):
         from claude_tap.compact_trace import materialize_compact_trace_bundle
@@ -69,8 +73,8 @@ def _load_records_from_text(text: str) -> tuple[list[dict], dict | None]:
         if not line:
             continue
         try:
-            record = json.loads(line)
-        except json.JSONDecodeError:
+            record = json_loads(line)
+        except ValueError:
             continue
         if isinstance(record, dict):
             records.append(record)
@@ -109,6 +113,9 @@ def export_main(argv: list[str] | None = None) -> int:
     source_session_id = args.session_id
     store = None
     compact_bundle: dict | None = None
+    # Session records are normalized as they are loaded; trace files still
+    # need it for the formats that render viewer-shaped records.
+    records_normalized = False
 
     if source_session_id is None and args.source:
         trace_file = Path(args.source)
@@ -131,6 +138,7 @@ def export_main(argv: list[str] | None = None) -> int:
             normalized = _normalize_record_for_export(record)
             if normalized is not None:
                 records.append(normalized)
+        records_normalized = True
         html_source_path = Path(f"session-{source_session_id[:8]}.jsonl")
     elif args.source:
         trace_file = Path(args.source)
@@ -169,27 +177,27 @@ def export_main(argv: list[str] | None = None) -> int:
             return 1
         html_path = args.output or html_source_path.with_suffix(".html")
         if compact_bundle is not None:
-            _generate_html_viewer_from_compact_bundle(
+            generated = _generate_html_viewer_from_compact_bundle(
                 compact_bundle,
                 html_path,
                 display_trace_path=html_source_path.absolute(),
                 display_html_path=html_path.absolute(),
             )
-        elif source_session_id:
-            _generate_html_viewer_from_compact_bundle(
+        elif records_normalized:
+            generated = _generate_html_viewer_from_compact_bundle(
                 build_compact_trace_bundle(records),
                 html_path,
                 display_trace_path=f"session:{source_session_id}",
                 display_html_path=html_path.absolute(),
             )
         else:
-            _generate_html_viewer_from_compact_bundle(
+            generated = _generate_html_viewer_from_compact_bundle(
                 build_compact_trace_bundle(_normalize_records_for_export(records)),
                 html_path,
                 display_trace_path=html_source_path.absolute(),
                 display_html_path=html_path.absolute(),
             )
-        if not html_path.exists():
+        if not generated:
             print("Error: failed to generate HTML viewer", file=sys.stderr)
             return 1
         print(f"Exported {len(records)} turns to {html_path}")
@@ -207,9 +215,9 @@ def export_main(argv: list[str] | None = None) -> int:
             print(f"Error: {exc}", file=sys.stderr)
             return 1
     elif fmt == "json":
-        output = _export_json(_normalize_records_for_export(records))
+        output = _export_json(records if records_normalized else _normalize_records_for_export(records))
     else:
-        output = _export_markdown(_normalize_records_for_export(records))
+        output = _export_markdown(records if records_normalized else _normalize_records_for_export(records))
 
     if args.output:
         args.output.write_text(output, encoding="utf-8")
@@ -236,9 +244,10 @@ def _export_markdown(records: list[dict]) -> str:
     total_cache_read = 0
     total_cache_create = 0
     models: set[str] = set()
+    # Normalized once here and reused for the per-turn token lines below.
+    usages = [_usage_from(r) for r in records]
 
-    for r in records:
-        usage = _usage_from(r)
+    for r, usage in zip(records, usages):
         total_input += usage.get("input_tokens", 0)
         total_output += usage.get("output_tokens", 0)
         total_cache_read += usage.get("cache_read_input_tokens", 0)
@@ -259,7 +268,7 @@ def _export_markdown(records: list[dict]) -> str:
     lines.append("")
 
     # Each turn
-    for r in records:
+    for r, usage in zip(records, usages):
         turn = r.get("turn", "?")
         req_body = _request_body(r)
         resp_body = _response_body(r)
@@ -308,14 +317,13 @@ def _export_markdown(records: list[dict]) -> str:
                         name = block.get("name", "unknown")
                         inp = block.get("input", {})
                         lines.append(f"**Tool Use**: `{name}`\n")
-                        lines.append(f"```json\n{json.dumps(inp, indent=2, ensure_ascii=False)[:3000]}\n```\n")
+                        lines.append(f"```json\n{json_dumps_indented(inp)[:3000]}\n```\n")
                     elif block.get("type") == "thinking":
                         thinking = block.get("thinking", "")
                         if thinking.strip():
                             lines.append(f"<details>\n<summary>Thinking</summary>\n\n{thinking[:5000]}\n\n</details>\n")
 
         # Token usage
-        usage = normalize_usage(resp_body.get("usage"))
         if usage:
             parts = []
             if usage.get("input_tokens"):
@@ -364,4 +372,4 @@ def _export_json(records: list[dict]) -> str:
 
         cleaned.append(entry)
 
-    return json.dumps(cleaned, indent=2, ensure_ascii=False)
+    return json_dumps_indented(cleaned)
@@ -18,13 +18,11 @@ from __future__ import annotations
 
 import asyncio
 import base64
-import gzip
 import hashlib
 import json
 import logging
 import time
 import uuid
-import zlib
 from collections import deque
 from collections.abc import Mapping
 from urllib.parse import urlparse
@@ -38,9 +36,14 @@ from yarl import URL
 from claude_tap.bedrock import attach_bedrock_errors, is_bedrock_eventstream_path
 from claude_tap.certs import CertificateAuthority
 from claude_tap.proxy import (
-    HOP_BY_HOP,
+    _HEADER_HOP_BY_HOP,
+    STREAM_READ_CHUNK_BYTES,
+    UPSTREAM_REQUEST_TIMEOUT,
     _build_record,
-    _parse_request_body_for_trace,
+    _header_key_action,
+    _load_request_body_for_trace,
+    _parse_response_body_for_trace,
+    _ReassemblerFeed,
     capture_only_content_type,
     capture_only_response,
     capture_only_stream_bytes,
@@ -127,6 +130,23 @@ def _header_value(headers: Mapping[str, str], name: str) -> str:
     return ""
 
 
+def _encode_response_head(upstream_resp: aiohttp.ClientResponse, *, drop_content_length: bool = False) -> bytearray:
+    """Encode the status line and end-to-end headers of an upstream response.
+
+    Built into one buffer so the head goes out in a single write; header names
+    are classified through the proxy's per-name cache instead of lowercasing
+    each one against HOP_BY_HOP.
+    """
+    head = bytearray(f"HTTP/1.1 {upstream_resp.status} {upstream_resp.reason}\r\n".encode())
+    for key, value in upstream_resp.headers.items():
+        if _header_key_action(key) == _HEADER_HOP_BY_HOP:
+            continue
+        if drop_content_length and key.lower() == "content-length":
+            continue
+        head += f"{key}: {value}\r\n".encode()
+    return head
+
+
 def _has_package_manager_user_agent(headers: Mapping[str, str] | None) -> bool:
     if headers is None:
         return False
@@ -526,7 +546,9 @@ class ForwardProxyServer:
         t0 = time.monotonic()
         log_prefix = f"[Turn {turn}]" if turn is not None else "[relay]"
 
-        req_body = _parse_request_body_for_trace(body)
+        # Relayed requests are forwarded byte-for-byte and never recorded, so
+        # only traced requests pay for parsing the (often large) JSON body.
+        req_body = await _load_request_body_for_trace(body) if should_trace else None
         upstream_base_url = _upstream_base_url(upstream_url, path)
 
         is_streaming = is_capture_only_streaming_request(path, req_body)
@@ -582,7 +604,7 @@ class ForwardProxyServer:
                 url=upstream_url,
                 headers=fwd_headers,
                 data=body,
-                timeout=aiohttp.ClientTimeout(total=600, sock_read=300),
+                timeout=UPSTREAM_REQUEST_TIMEOUT,
             )
         except Exception as exc:
             duration_ms = int((time.monotonic() - t0) * 1000)
@@ -663,34 +685,34 @@ class ForwardProxyServer:
         upstream_base_url: str,
     ) -> None:
         """Handle a streaming response: forward chunks while recording SSE."""
-        # Send response status line
-        status_line = f"HTTP/1.1 {upstream_resp.status} {upstream_resp.reason}\r\n"
-        client_writer.write(status_line.encode())
-
-        # Send response headers (filter hop-by-hop, use chunked transfer)
-        for key, value in upstream_resp.headers.items():
-            if key.lower() not in HOP_BY_HOP:
-                client_writer.write(f"{key}: {value}\r\n".encode())
-        client_writer.write(b"Transfer-Encoding: chunked\r\n")
-        client_writer.write(b"\r\n")
+        # Send status line and headers (filter hop-by-hop, use chunked transfer)
+        head = _encode_response_head(upstream_resp)
+        head += b"Transfer-Encoding: chunked\r\n\r\n"
+        client_writer.write(head)
         await client_writer.drain()
 
         is_bedrock_stream = is_bedrock_eventstream_path(path)
         reassembler = SSEReassembler(store_events=self._store_stream_events)
+        feed = None if is_bedrock_stream else _ReassemblerFeed(reassembler)
         raw_chunks: list[bytes] = []
 
+        stream_failed = True
         try:
-            async for chunk in upstream_resp.content.iter_any():
+            async for chunk in upstream_resp.content.iter_chunked(STREAM_READ_CHUNK_BYTES):
                 # Send as HTTP chunked encoding
                 chunk_header = f"{len(chunk):x}\r\n".encode()
                 client_writer.write(chunk_header + chunk + b"\r\n")
                 await client_writer.drain()
-                if is_bedrock_stream:
+                if feed is None:
                     raw_chunks.append(chunk)
                 else:
-                    reassembler.feed_bytes(chunk)
+                    await feed.feed(chunk)
+            stream_failed = False
         except (ConnectionError, asyncio.CancelledError):
-            pass
+            stream_failed = False
+        finally:
+            if feed is not None:
+                await feed.close(abort=stream_failed)
 
         # Send final chunk
         try:
@@ -763,23 +785,7 @@ class ForwardProxyServer:
 
         resp_bytes = await upstream_resp.read()
         duration_ms = int((time.monotonic() - t0) * 1000)
-
-        # Decompress for JSON parsing
-        content_encoding = upstream_resp.headers.get("Content-Encoding", "").lower()
-        decode_bytes = resp_bytes
-        if resp_bytes and content_encoding in ("gzip", "deflate"):
-            try:
-                if content_encoding == "gzip":
-                    decode_bytes = gzip.decompress(resp_bytes)
-                else:
-                    decode_bytes = zlib.decompress(resp_bytes)
-            except Exception:
-                pass
-
-        try:
-            resp_body = json.loads(decode_bytes) if decode_bytes else None
-        except (json.JSONDecodeError, ValueError):
-            resp_body = decode_bytes.decode("utf-8", errors="replace") if decode_bytes else None
+        resp_body = await _parse_response_body_for_trace(resp_bytes, upstream_resp.headers.get("Content-Encoding", ""))
 
         log.info(f"{log_prefix} <- {upstream_resp.status} ({duration_ms}ms, {len(resp_bytes)} bytes)")
 
@@ -806,14 +812,10 @@ class ForwardProxyServer:
         client_writer: asyncio.StreamWriter,
         resp_bytes: bytes,
     ) -> None:
-        status_line = f"HTTP/1.1 {upstream_resp.status} {upstream_resp.reason}\r\n"
-        client_writer.write(status_line.encode())
-        skip_headers = HOP_BY_HOP | {"content-length"}  # We set Content-Length ourselves
-        for key, value in upstream_resp.headers.items():
-            if key.lower() not in skip_headers:
-                client_writer.write(f"{key}: {value}\r\n".encode())
-        client_writer.write(f"Content-Length: {len(resp_bytes)}\r\n".encode())
-        client_writer.write(b"\r\n")
+        # We set Content-Length ourselves
+        head = _encode_response_head(upstream_resp, drop_content_length=True)
+        head += f"Content-Length: {len(resp_bytes)}\r\n\r\n".encode()
+        client_writer.write(head)
         client_writer.write(resp_bytes)
         await client_writer.drain()
 
@@ -824,23 +826,19 @@ class ForwardProxyServer:
     ) -> int:
         total_bytes = 0
         try:
-            status_line = f"HTTP/1.1 {upstream_resp.status} {upstream_resp.reason}\r\n"
-            client_writer.write(status_line.encode())
-            skip_headers = HOP_BY_HOP | {"content-length"}
             content_length = _header_value(upstream_resp.headers, "Content-Length")
-            for key, value in upstream_resp.headers.items():
-                if key.lower() not in skip_headers:
-                    client_writer.write(f"{key}: {value}\r\n".encode())
+            head = _encode_response_head(upstream_resp, drop_content_length=True)
             if content_length:
-                client_writer.write(f"Content-Length: {content_length}\r\n".encode())
+                head += f"Content-Length: {content_length}\r\n".encode()
                 chunked = False
             else:
-                client_writer.write(b"Transfer-Encoding: chunked\r\n")
+                head += b"Transfer-Encoding: chunked\r\n"
                 chunked = True
-            client_writer.write(b"\r\n")
+            head += b"\r\n"
+            client_writer.write(head)
             await client_writer.drain()
 
-            async for chunk in upstream_resp.content.iter_chunked(65536):
+            async for chunk in upstream_resp.content.iter_chunked(STREAM_READ_CHUNK_BYTES):
                 total_bytes += len(chunk)
                 if chunked:
                     client_writer.write(f"{len(chunk):x}\r\n".encode() + chunk + b"\r\n")
@@ -875,8 +873,10 @@ class ForwardProxyServer:
         fwd_headers = filter_headers(headers)
         fwd_headers.pop("Host", None)
         fwd_headers.pop("host", None)
+        # filter_headers() has already dropped hop-by-hop headers; only the
+        # client's handshake headers are left to strip.
         for h in list(fwd_headers.keys()):
-            if h.lower() in HOP_BY_HOP or h.lower().startswith("sec-websocket-"):
+            if h.lower().startswith("sec-websocket-"):
                 del fwd_headers[h]
 
         protocols: tuple[str, ...] = ()
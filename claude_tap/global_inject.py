@@ -184,8 +184,8 @@ def _restore_files(entries: list[object]) -> None:
             if backup_path and backup_path.exists():
                 path.write_bytes(backup_path.read_bytes())
                 backup_path.unlink()
-        elif path.exists():
-            path.unlink()
+        else:
+            path.unlink(missing_ok=True)
 
 
 def _record_backup(path: Path, files: list[dict[str, object]]) -> bool:
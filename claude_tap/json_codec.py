@@ -0,0 +1,81 @@
+"""Compact JSON encode/decode for trace hot paths.
+
+Uses orjson when it is installed (the ``fast`` extra) and falls back to the
+stdlib ``json`` module otherwise. For strings, ints, bools, None, lists, dicts
+and most floats both backends produce ``json.dumps(obj, ensure_ascii=False,
+separators=(",", ":"))``, but the output is not byte-identical in general:
+
+- orjson writes NaN and +/-Infinity as ``null``; the stdlib writes ``NaN`` and
+  ``Infinity``, which ``json_loads`` reads back as floats.
+- Some floats are spelled differently, e.g. ``0.00001`` and ``1e-7`` from
+  orjson versus ``1e-05`` and ``1e-07`` from the stdlib.
+- orjson serializes ``uuid.UUID`` and ``enum.Enum`` values the stdlib rejects.
+  datetimes and dataclasses go through the stdlib encoder on both backends,
+  so they raise ``TypeError`` either way.
+
+Trace store blob hashes are taken over these bytes, so a database written by
+processes using different backends can hold the same value under two hashes.
+That only costs deduplication; decoded records are unaffected.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _stdlib_dumps_indented(obj: Any) -> str:
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+if orjson is not None:
+    # Hand datetimes and dataclasses to the stdlib fallback, which rejects
+    # them, instead of letting orjson serialize types the stdlib cannot.
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def json_loads(data: str | bytes | bytearray | memoryview) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the stdlib (NaN/Infinity literals,
+            # lone surrogates); re-parse so callers see identical results.
+            return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # Integers wider than 64 bits, lone surrogates, passed-through types, etc.
+            return _stdlib_dumps(obj).encode("utf-8", errors="surrogatepass")
+
+    def json_dumps(obj: Any) -> str:
+        return json_dumps_bytes(obj).decode("utf-8", errors="surrogatepass")
+
+    def json_dumps_indented(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS | orjson.OPT_INDENT_2).decode("utf-8")
+        except TypeError:
+            return _stdlib_dumps_indented(obj)
+
+else:
+
+    def json_loads(data: str | bytes | bytearray | memoryview) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+    def json_dumps(obj: Any) -> str:
+        return _stdlib_dumps(obj)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        return _stdlib_dumps(obj).encode("utf-8", errors="surrogatepass")
+
+    def json_dumps_indented(obj: Any) -> str:
+        return _stdlib_dumps_indented(obj)
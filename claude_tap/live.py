@@ -8,6 +8,7 @@ import json
 import re
 import secrets
 import tempfile
+from collections import deque
 from datetime import date
 from pathlib import Path
 from urllib.parse import quote, urlsplit
@@ -26,20 +27,29 @@ from claude_tap.dashboard import (
     redact_dashboard_summary,
 )
 from claude_tap.history import delete_trace_history, migrate_legacy_traces
+from claude_tap.json_codec import json_dumps, json_dumps_bytes
 from claude_tap.shared_dashboard import CLAUDE_TAP_VERSION, dashboard_url
-from claude_tap.trace_store import get_trace_store, resolve_db_path
+from claude_tap.trace_store import TraceStore, get_trace_store, resolve_db_path
 from claude_tap.viewer import (
     VIEWER_SCRIPT_ANCHOR,
     VIEWER_TEMPLATE_PATH,
     _extract_metadata_from_record,
     _generate_html_viewer_from_compact_bundle,
     _generate_html_viewer_from_metadata,
-    _normalize_record_for_viewer,
-    _read_viewer_template,
+    _normalize_record_dict_for_viewer,
+    _viewer_template_parts,
 )
 
 _DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 DEFAULT_SESSION_PAGE_LIMIT = 100
+# Most recent records kept in memory for /records and new /events clients.
+# Every record is also in SQLite, so older ones remain reachable through the
+# session APIs; this only bounds memory and the replay cost per connect.
+LIVE_RECORD_BUFFER_SIZE = 1000
+# Pending messages per /events client. A client that falls further behind is
+# disconnected rather than stalling broadcast() or growing memory without
+# bound; EventSource reconnects and the replayed history fills the gap.
+LIVE_CLIENT_QUEUE_SIZE = 256
 MAX_SESSION_PAGE_LIMIT = 500
 
 _DASHBOARD_QUIT_TOKEN_HEADER = "X-Claude-Tap-Dashboard-Token"
@@ -115,6 +125,19 @@ def _untrusted_dashboard_token_response() -> web.Response:
     )
 
 
+def _put_dropping_oldest(queue: asyncio.Queue, item: object) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+def _end_client_queue(queue: asyncio.Queue) -> None:
+    """Discard pending messages and tell the client's handler to finish."""
+    while not queue.empty():
+        queue.get_nowait()
+    queue.put_nowait(None)
+
+
 def _record_limit_from_request(request: web.Request) -> int | None:
     value = request.query.get("limit")
     if value is None:
@@ -168,6 +191,34 @@ def _session_query_from_request(request: web.Request):
     )
 
 
+def _dashboard_event_message(payload: dict) -> bytes:
+    event_name = payload.get("type", "message")
+    return f"event: {event_name}\ndata: {json_dumps(payload)}\n\n".encode("utf-8")
+
+
+def _render_session_export_html(store: TraceStore, session_id: str) -> bytes | None:
+    """Render a standalone HTML export of a stored session, as UTF-8 bytes."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        html_path = Path(tmpdir) / f"trace_{session_id[:8]}.html"
+        records = []
+        for record in store.load_records(session_id):
+            if isinstance(record, dict):
+                # Records loaded from the store are fresh dicts, so they
+                # can be normalized in place without a JSON round-trip.
+                _normalize_record_dict_for_viewer(record)
+                records.append(record)
+        generated = _generate_html_viewer_from_compact_bundle(
+            build_compact_trace_bundle(records),
+            html_path,
+            display_trace_path=f"/api/sessions/{quote(session_id)}/export/compact",
+            display_html_path=f"/api/sessions/{quote(session_id)}/export/html",
+        )
+        if not generated:
+            return None
+        # Served as the encoded file contents; no decode/re-encode round-trip.
+        return html_path.read_bytes()
+
+
 class LiveViewerServer:
     """HTTP server for real-time trace viewing via SSE."""
 
@@ -184,9 +235,17 @@ class LiveViewerServer:
         self.host = host
         self.migrate_from = migrate_from
         self.dashboard_mode = dashboard_mode
-        self._sse_clients: list[web.StreamResponse] = []
-        self._dashboard_clients: list[web.StreamResponse] = []
-        self._records: list[dict] = []
+        # /events clients and their pending messages; each client's handler
+        # drains its own queue, so broadcast() never waits on a slow reader.
+        self._sse_clients: dict[web.StreamResponse, asyncio.Queue[bytes | None]] = {}
+        # Sets so connect/disconnect are O(1); iterate over a tuple copy since
+        # clients can come and go while a broadcast is awaiting writes.
+        self._dashboard_clients: set[web.StreamResponse] = set()
+        self._records: deque[dict] = deque(maxlen=LIVE_RECORD_BUFFER_SIZE)
+        # Pre-framed SSE bytes for each buffered record, kept in step with
+        # _records so replaying history to a new client does no JSON work.
+        self._record_frames: deque[bytes] = deque(maxlen=LIVE_RECORD_BUFFER_SIZE)
+        self._record_count = 0
         self._current_date: str = date.today().isoformat()
         self._lock = asyncio.Lock()
         self._runner: web.AppRunner | None = None
@@ -196,6 +255,9 @@ class LiveViewerServer:
         self._dashboard_watch_task: asyncio.Task | None = None
         self._dashboard_snapshot: dict[str, tuple[str, int, str]] = {}
         self._dashboard_quit_token = secrets.token_urlsafe(32)
+        # Encoded live viewer page; built on the first request to / since
+        # nothing it embeds changes while the server runs.
+        self._index_body: bytes | None = None
 
     async def start(self) -> int:
         """Start the viewer server and return the actual port."""
@@ -259,13 +321,14 @@ class LiveViewerServer:
                 except asyncio.CancelledError:
                     pass
                 self._dashboard_watch_task = None
-            for client in self._sse_clients:
+            for client, queue in tuple(self._sse_clients.items()):
+                _put_dropping_oldest(queue, None)
                 try:
                     await client.write_eof()
                 except Exception:
                     pass
             self._sse_clients.clear()
-            for client in self._dashboard_clients:
+            for client in tuple(self._dashboard_clients):
                 try:
                     await client.write_eof()
                 except Exception:
@@ -283,25 +346,26 @@ class LiveViewerServer:
 
     async def broadcast(self, record: dict) -> None:
         """Broadcast a new record to all connected SSE clients."""
+        # Serialize once; every client receives the same bytes.
+        message = b"data: " + json_dumps_bytes(record) + b"\n\n"
         async with self._lock:
             today = date.today().isoformat()
             if today != self._current_date:
                 self._records.clear()
+                self._record_frames.clear()
+                self._record_count = 0
                 self._current_date = today
             self._records.append(record)
-
-        data = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
-        message = f"data: {data}\n\n"
-
-        disconnected = []
-        for client in self._sse_clients:
-            try:
-                await client.write(message.encode("utf-8"))
-            except (ConnectionError, ConnectionResetError, Exception):
-                disconnected.append(client)
-
-        for client in disconnected:
-            self._sse_clients.remove(client)
+            self._record_frames.append(message)
+            self._record_count += 1
+            for client, queue in tuple(self._sse_clients.items()):
+                if queue.full():
+                    # Dropping messages would leave a silent gap; end the
+                    # stream so the client reconnects and replays history.
+                    del self._sse_clients[client]
+                    _end_client_queue(queue)
+                else:
+                    queue.put_nowait(message)
 
         await self._broadcast_dashboard_event({"type": "record", "session_id": self.session_id})
 
@@ -381,20 +445,16 @@ class LiveViewerServer:
 
     async def _handle_index(self, request: web.Request) -> web.Response:
         """Serve the viewer HTML with live mode enabled."""
-        if not VIEWER_TEMPLATE_PATH.exists():
-            return web.Response(status=404, text="viewer.html not found")
-
-        html = _read_viewer_template()
-        live_js = (
-            "const LIVE_MODE = true;\nconst EMBEDDED_TRACE_DATA = [];\n"
-            f"const __TRACE_SESSION_ID__ = {json.dumps(self.session_id or '')};\n"
-        )
-        html = html.replace(
-            VIEWER_SCRIPT_ANCHOR,
-            f"<script>\n{live_js}</script>\n{VIEWER_SCRIPT_ANCHOR}",
-            1,
-        )
-        return web.Response(text=html, content_type="text/html")
+        if self._index_body is None:
+            if not VIEWER_TEMPLATE_PATH.exists():
+                return web.Response(status=404, text="viewer.html not found")
+            head, tail = _viewer_template_parts()
+            live_js = (
+                "const LIVE_MODE = true;\nconst EMBEDDED_TRACE_DATA = [];\n"
+                f"const __TRACE_SESSION_ID__ = {json.dumps(self.session_id or '')};\n"
+            )
+            self._index_body = f"{head}<script>\n{live_js}</script>\n{tail}".encode("utf-8")
+        return web.Response(body=self._index_body, content_type="text/html", charset="utf-8")
 
     async def _handle_sse(self, request: web.Request) -> web.StreamResponse:
         """SSE endpoint for live trace updates."""
@@ -409,30 +469,29 @@ class LiveViewerServer:
         )
         await resp.prepare(request)
 
+        # Register and snapshot together, then replay outside the lock so a
+        # slow client does not hold up broadcast(); records broadcast while
+        # replaying wait in the client's queue, after the history.
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=LIVE_CLIENT_QUEUE_SIZE)
         async with self._lock:
-            for record in self._records:
-                data = json.dumps(record, ensure_ascii=False, separators=(",", ":"))
-                await resp.write(f"data: {data}\n\n".encode("utf-8"))
-
-        self._sse_clients.append(resp)
+            history = list(self._record_frames)
+            self._sse_clients[resp] = queue
 
         try:
+            for frame in history:
+                await resp.write(frame)
             while not self._shutdown_event.is_set():
                 try:
-                    await asyncio.wait_for(self._shutdown_event.wait(), timeout=30)
+                    message = await asyncio.wait_for(queue.get(), timeout=30)
                 except asyncio.TimeoutError:
-                    pass
-                if self._shutdown_event.is_set():
+                    message = b": keepalive\n\n"
+                if message is None or self._shutdown_event.is_set():
                     break
-                try:
-                    await resp.write(b": keepalive\n\n")
-                except (ConnectionError, ConnectionResetError, RuntimeError):
-                    break
-        except asyncio.CancelledError:
+                await resp.write(message)
+        except (ConnectionError, ConnectionResetError, RuntimeError, asyncio.CancelledError):
             pass
         finally:
-            if resp in self._sse_clients:
-                self._sse_clients.remove(resp)
+            self._sse_clients.pop(resp, None)
 
         return resp
 
@@ -448,7 +507,7 @@ class LiveViewerServer:
             },
         )
         await resp.prepare(request)
-        self._dashboard_clients.append(resp)
+        self._dashboard_clients.add(resp)
         await self._write_dashboard_event(resp, {"type": "ready"})
 
         try:
@@ -466,15 +525,18 @@ class LiveViewerServer:
         except asyncio.CancelledError:
             pass
         finally:
-            if resp in self._dashboard_clients:
-                self._dashboard_clients.remove(resp)
+            self._dashboard_clients.discard(resp)
 
         return resp
 
     async def _handle_records(self, request: web.Request) -> web.Response:
-        """Return all records as JSON array."""
+        """Return buffered live records as a JSON array (the newest ``limit`` if given)."""
+        limit = _record_limit_from_request(request)
         async with self._lock:
-            return web.json_response(self._records)
+            records = list(self._records)
+        if limit is not None:
+            records = records[-limit:] if limit else []
+        return web.json_response(records, dumps=json_dumps)
 
     async def _handle_dates(self, request: web.Request) -> web.Response:
         """Return available trace dates (descending)."""
@@ -489,7 +551,7 @@ class LiveViewerServer:
             return web.Response(status=400, text="Invalid date format")
 
         records = ensure_trace_store().load_records_for_date(date_key)
-        return web.json_response(records)
+        return web.json_response(records, dumps=json_dumps)
 
     async def _handle_agents(self, request: web.Request) -> web.Response:
         """Return trace history agent buckets."""
@@ -544,7 +606,7 @@ class LiveViewerServer:
         )
         if session is None:
             return web.json_response({"error": "Session not found"}, status=404)
-        return web.json_response(session)
+        return web.json_response(session, dumps=json_dumps)
 
     async def _handle_session_html_compat(self, request: web.Request) -> web.Response:
         return await self._session_html_response(request.match_info["session_id"])
@@ -566,14 +628,14 @@ class LiveViewerServer:
                 for record in store.load_records(session_id)
                 if (item := _extract_metadata_from_record(record)) is not None
             ]
-            _generate_html_viewer_from_metadata(
+            generated = _generate_html_viewer_from_metadata(
                 metadata,
                 html_path,
                 display_trace_path=export_urls["compact"],
                 display_html_path=f"/dashboard/session/{quote(session_id)}",
                 records_api_path=f"/api/sessions/{quote(session_id)}/records",
             )
-            if not html_path.exists():
+            if not generated:
                 return web.Response(status=500, text="Failed to generate session viewer")
             html = html_path.read_text(encoding="utf-8")
             export_js = f"const __TRACE_SESSION_EXPORTS__ = {json.dumps(export_urls, separators=(',', ':'))};\n"
@@ -586,7 +648,7 @@ class LiveViewerServer:
 
     async def _current_live_record_count(self) -> int:
         async with self._lock:
-            return len(self._records)
+            return self._record_count
 
     async def _handle_export_jsonl(self, request: web.Request) -> web.Response:
         session_id = request.match_info["session_id"]
@@ -700,29 +762,14 @@ class LiveViewerServer:
         store = ensure_trace_store()
         if store.load_session_row(session_id) is None:
             return web.Response(status=404, text="Session not found")
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmp_path = Path(tmpdir)
-            html_path = tmp_path / f"trace_{session_id[:8]}.html"
-            records = []
-            for record in store.load_records(session_id):
-                try:
-                    normalized = json.loads(_normalize_record_for_viewer(json.dumps(record, ensure_ascii=False)))
-                except (TypeError, json.JSONDecodeError):
-                    normalized = record
-                if isinstance(normalized, dict):
-                    records.append(normalized)
-            _generate_html_viewer_from_compact_bundle(
-                build_compact_trace_bundle(records),
-                html_path,
-                display_trace_path=f"/api/sessions/{quote(session_id)}/export/compact",
-                display_html_path=f"/api/sessions/{quote(session_id)}/export/html",
-            )
-            if not html_path.exists():
-                return web.Response(status=500, text="Failed to generate session viewer")
-            body = html_path.read_text(encoding="utf-8")
+        # Loading and rendering a long session takes a while; keep it off the
+        # event loop that is also serving the proxy and live updates.
+        body = await asyncio.to_thread(_render_session_export_html, store, session_id)
+        if body is None:
+            return web.Response(status=500, text="Failed to generate session viewer")
         filename = f"trace_{session_id[:8]}.html"
         return web.Response(
-            text=body,
+            body=body,
             content_type="text/html",
             charset="utf-8",
             headers={"Content-Disposition": f'attachment; filename="{filename}"'},
@@ -745,20 +792,17 @@ class LiveViewerServer:
     async def _broadcast_dashboard_event(self, payload: dict) -> None:
         if not self._dashboard_clients:
             return
-        disconnected = []
-        for client in self._dashboard_clients:
-            try:
-                await self._write_dashboard_event(client, payload)
-            except (ConnectionError, ConnectionResetError, RuntimeError, Exception):
-                disconnected.append(client)
-        for client in disconnected:
-            if client in self._dashboard_clients:
-                self._dashboard_clients.remove(client)
+        clients = tuple(self._dashboard_clients)
+        message = _dashboard_event_message(payload)
+        # Write to every dashboard at once so one slow reader does not hold
+        # up the rest; a failed write drops that client.
+        results = await asyncio.gather(*(client.write(message) for client in clients), return_exceptions=True)
+        self._dashboard_clients.difference_update(
+            client for client, result in zip(clients, results) if isinstance(result, BaseException)
+        )
 
     async def _write_dashboard_event(self, client: web.StreamResponse, payload: dict) -> None:
-        event_name = payload.get("type", "message")
-        data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
-        await client.write(f"event: {event_name}\ndata: {data}\n\n".encode("utf-8"))
+        await client.write(_dashboard_event_message(payload))
 
     async def _handle_delete_traces_by_date(self, request: web.Request) -> web.Response:
         """Delete stored trace sessions for a selected history date."""
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import asyncio
-import gzip
 import hashlib
 import json
 import logging
@@ -13,12 +12,14 @@ import time
 import uuid
 import zlib
 from datetime import datetime, timezone
+from functools import lru_cache
 
 import aiohttp
 from aiohttp import web
 from yarl import URL
 
 from claude_tap.bedrock import attach_bedrock_errors, bedrock_model_from_path, is_bedrock_eventstream_path
+from claude_tap.json_codec import json_dumps_bytes, json_loads
 from claude_tap.sse import SSEReassembler
 from claude_tap.trace import TraceWriter
 from claude_tap.upstream import build_upstream_url, format_upstream_error
@@ -65,19 +66,61 @@ SENSITIVE_HEADER_KEYS = frozenset(
     }
 )
 PREFIX_REDACTED_HEADER_KEYS = frozenset({"authorization", "x-api-key"})
+# Buffered response bodies at least this large are decompressed and parsed for
+# the trace in a worker thread instead of on the event loop.
+OFFLOAD_RESPONSE_DECODE_BYTES = 256 * 1024
+OFFLOAD_REQUEST_PARSE_BYTES = 256 * 1024
+# Upper bound for one read from an upstream stream. iter_chunked() hands back
+# everything already buffered up to this size without waiting for more, so a
+# burst of small SSE frames is relayed and parsed as one chunk instead of one
+# write and one parser pass per frame.
+STREAM_READ_CHUNK_BYTES = 64 * 1024
+
+
+_HEADER_KEEP = 0
+_HEADER_HOP_BY_HOP = 1
+_HEADER_REDACT = 2
+_HEADER_REDACT_PREFIX = 3
+# Classification of header names as sent on the wire, so each name is
+# lowercased and checked against the sets above once per process rather than
+# once per request. Bounded so arbitrary client header names cannot grow it
+# without limit.
+_HEADER_KEY_ACTIONS: dict[str, int] = {}
+_HEADER_KEY_ACTIONS_MAX = 1024
+
+
+def _header_key_action(key: str) -> int:
+    action = _HEADER_KEY_ACTIONS.get(key)
+    if action is None:
+        lowered = key.lower()
+        if lowered in HOP_BY_HOP:
+            action = _HEADER_HOP_BY_HOP
+        elif lowered in PREFIX_REDACTED_HEADER_KEYS:
+            action = _HEADER_REDACT_PREFIX
+        elif lowered in SENSITIVE_HEADER_KEYS:
+            action = _HEADER_REDACT
+        else:
+            action = _HEADER_KEEP
+        if len(_HEADER_KEY_ACTIONS) < _HEADER_KEY_ACTIONS_MAX:
+            _HEADER_KEY_ACTIONS[key] = action
+    return action
 
 
 def filter_headers(headers: dict[str, str], *, redact_keys: bool = False) -> dict[str, str]:
     """Filter hop-by-hop headers and optionally redact sensitive values."""
     out: dict[str, str] = {}
     for k, v in headers.items():
-        key = k.lower()
-        if key in HOP_BY_HOP:
+        action = _header_key_action(k)
+        if action == _HEADER_KEEP:
+            out[k] = v
+        elif action == _HEADER_HOP_BY_HOP:
             continue
-        if redact_keys and key in SENSITIVE_HEADER_KEYS:
-            out[k] = v[:12] + "..." if key in PREFIX_REDACTED_HEADER_KEYS and len(v) > 12 else "***"
-        else:
+        elif not redact_keys:
             out[k] = v
+        elif action == _HEADER_REDACT_PREFIX and len(v) > 12:
+            out[k] = v[:12] + "..."
+        else:
+            out[k] = "***"
     return out
 
 
@@ -87,7 +130,7 @@ def _parse_request_body_for_trace(body: bytes) -> object:
         return None
 
     try:
-        parsed = json.loads(body)
+        parsed = json_loads(body)
     except (json.JSONDecodeError, ValueError):
         return body.decode("utf-8", errors="replace")
 
@@ -102,6 +145,64 @@ def _parse_request_body_for_trace(body: bytes) -> object:
     return parsed
 
 
+async def _load_request_body_for_trace(body: bytes) -> object:
+    """Parse a buffered request body, off the event loop when it is large.
+
+    Agent requests carry the whole conversation, so later turns routinely
+    reach megabytes; parsing those inline would hold up every other stream
+    the proxy is relaying.
+    """
+    if len(body) >= OFFLOAD_REQUEST_PARSE_BYTES:
+        return await asyncio.to_thread(_parse_request_body_for_trace, body)
+    return _parse_request_body_for_trace(body)
+
+
+def _gunzip(data: bytes) -> bytes:
+    """Decompress a gzip body, including multi-member streams, like
+    gzip.decompress() but without its Python-level header parsing, extra
+    copy of the compressed input and separate CRC pass."""
+    parts: list[bytes] = []
+    while data:
+        decompressor = zlib.decompressobj(wbits=31)
+        parts.append(decompressor.decompress(data))
+        if not decompressor.eof:
+            raise EOFError("truncated gzip stream")
+        data = decompressor.unused_data.lstrip(b"\0")
+    return b"".join(parts)
+
+
+def _decode_response_body_for_trace(resp_bytes: bytes, content_encoding: str) -> object:
+    # Decompress for JSON parsing (raw bytes are forwarded as-is to client)
+    decode_bytes = resp_bytes
+    if content_encoding in ("gzip", "deflate"):
+        try:
+            if content_encoding == "gzip":
+                decode_bytes = _gunzip(resp_bytes)
+            else:
+                decode_bytes = zlib.decompress(resp_bytes)
+        except Exception:
+            pass
+
+    try:
+        return json_loads(decode_bytes) if decode_bytes else None
+    except (json.JSONDecodeError, ValueError):
+        return decode_bytes.decode("utf-8", errors="replace") if decode_bytes else None
+
+
+async def _parse_response_body_for_trace(resp_bytes: bytes, content_encoding: str) -> object:
+    """Decompress and parse a buffered response body for trace storage.
+
+    Large bodies are handled in a worker thread so decompression and JSON
+    parsing do not stall other in-flight requests on the event loop.
+    """
+    if not resp_bytes:
+        return None
+    content_encoding = content_encoding.lower()
+    if len(resp_bytes) >= OFFLOAD_RESPONSE_DECODE_BYTES:
+        return await asyncio.to_thread(_decode_response_body_for_trace, resp_bytes, content_encoding)
+    return _decode_response_body_for_trace(resp_bytes, content_encoding)
+
+
 # ---------------------------------------------------------------------------
 # Path allowlist – only forward requests to known API endpoints.
 # Scanners / crawlers hitting the proxy with paths like /etc/passwd, /swagger,
@@ -172,6 +273,7 @@ _ANTHROPIC_METADATA_USER_ID_PATTERN = re.compile(r"^[a-zA-Z0-9_-]+$")
 _BEDROCK_GATEWAY_UNSUPPORTED_BODY_FIELDS = frozenset({"context_management", "output_config"})
 
 
+@lru_cache(maxsize=32)
 def _is_deepseek_anthropic_target(target: str) -> bool:
     """Return True for DeepSeek's Anthropic-compatible API target."""
     try:
@@ -563,6 +665,25 @@ def _bedrock_eventstream_header(name: str, value: str) -> bytes:
 # ---------------------------------------------------------------------------
 
 
+# Upstream connection pool: agent turns are often separated by tool execution,
+# so keep idle upstream connections (and their TLS sessions) longer than
+# aiohttp's 15s default while staying under the ~60s idle timeout of common
+# load balancers, and cache DNS instead of re-resolving every 10s.
+UPSTREAM_KEEPALIVE_TIMEOUT_SECONDS = 45
+UPSTREAM_DNS_CACHE_TTL_SECONDS = 300
+# Per-request upstream timeout; long generations can stream for minutes.
+UPSTREAM_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=600, sock_read=300)
+
+
+def create_upstream_session() -> aiohttp.ClientSession:
+    """Create the client session shared by every proxied upstream request."""
+    connector = aiohttp.TCPConnector(
+        ttl_dns_cache=UPSTREAM_DNS_CACHE_TTL_SECONDS,
+        keepalive_timeout=UPSTREAM_KEEPALIVE_TIMEOUT_SECONDS,
+    )
+    return aiohttp.ClientSession(connector=connector, auto_decompress=False, trust_env=True)
+
+
 async def proxy_handler(request: web.Request) -> web.StreamResponse:
     # Reject requests to unknown paths (scanner/crawler protection)
     ctx: dict = request.app["trace_ctx"]
@@ -611,7 +732,7 @@ async def proxy_handler(request: web.Request) -> web.StreamResponse:
     req_id = f"req_{uuid.uuid4().hex[:12]}"
     t0 = time.monotonic()
 
-    req_body = _parse_request_body_for_trace(body)
+    req_body = await _load_request_body_for_trace(body)
     trace_req_body = req_body
     upstream_req_body = req_body
 
@@ -620,7 +741,7 @@ async def proxy_handler(request: web.Request) -> web.StreamResponse:
         normalized_req_body = _normalize_request_body_for_upstream(req_body, target)
         if normalized_req_body is not req_body:
             upstream_req_body = normalized_req_body
-            upstream_body = json.dumps(upstream_req_body, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+            upstream_body = json_dumps_bytes(upstream_req_body)
             for key in list(fwd_headers.keys()):
                 if key.lower() == "content-length":
                     del fwd_headers[key]
@@ -682,7 +803,7 @@ async def proxy_handler(request: web.Request) -> web.StreamResponse:
             url=upstream_url,
             headers=fwd_headers,
             data=upstream_body,
-            timeout=aiohttp.ClientTimeout(total=600, sock_read=300),
+            timeout=UPSTREAM_REQUEST_TIMEOUT,
         )
     except Exception as exc:
         error_text = format_upstream_error(exc, target_url=target, upstream_url=upstream_url)
@@ -722,6 +843,53 @@ async def proxy_handler(request: web.Request) -> web.StreamResponse:
     )
 
 
+class _ReassemblerFeed:
+    """Feed streamed chunks to an SSEReassembler from a separate task.
+
+    The forwarding loop only enqueues each chunk after writing it to the
+    client, so parsing runs whenever that loop is waiting on client or
+    upstream I/O instead of delaying the next chunk. The queue is bounded so
+    a parser that falls behind eventually applies backpressure.
+    """
+
+    QUEUE_SIZE = 64
+
+    def __init__(self, reassembler: SSEReassembler):
+        self._reassembler = reassembler
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._task = asyncio.create_task(self._run())
+
+    async def feed(self, chunk: bytes) -> None:
+        await self._queue.put(chunk)
+
+    async def close(self, *, abort: bool = False) -> None:
+        """Wait until every queued chunk has been parsed.
+
+        With ``abort=True`` the parser task is cancelled instead; used when the
+        stream failed and nothing more will be read from the reassembler.
+        """
+        if abort:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            return
+        if not self._task.done():
+            await self._queue.put(None)
+        await self._task
+
+    async def _run(self) -> None:
+        failed = False
+        while (chunk := await self._queue.get()) is not None:
+            if failed:
+                continue
+            try:
+                self._reassembler.feed_bytes(chunk)
+            except Exception:
+                # Keep draining so the forwarding loop never blocks on a
+                # full queue; the trace just loses the rest of the stream.
+                failed = True
+                log.exception("SSE reassembly failed; remaining stream events are not traced")
+
+
 async def _handle_streaming(
     request: web.Request,
     upstream_resp: aiohttp.ClientResponse,
@@ -735,25 +903,29 @@ async def _handle_streaming(
     store_stream_events: bool,
     should_trace: bool,
 ) -> web.StreamResponse:
-    resp = web.StreamResponse(
-        status=upstream_resp.status,
-        headers={k: v for k, v in upstream_resp.headers.items() if k.lower() not in HOP_BY_HOP},
-    )
+    resp_headers = filter_headers(upstream_resp.headers)
+    resp = web.StreamResponse(status=upstream_resp.status, headers=resp_headers)
     await resp.prepare(request)
 
     is_bedrock_stream = is_bedrock_eventstream_path(request.raw_path)
     reassembler = SSEReassembler(store_events=store_stream_events)
+    feed = None if is_bedrock_stream else _ReassemblerFeed(reassembler)
     raw_chunks: list[bytes] = []
 
+    stream_failed = True
     try:
-        async for chunk in upstream_resp.content.iter_any():
+        async for chunk in upstream_resp.content.iter_chunked(STREAM_READ_CHUNK_BYTES):
             await resp.write(chunk)
-            if is_bedrock_stream:
+            if feed is None:
                 raw_chunks.append(chunk)
             else:
-                reassembler.feed_bytes(chunk)
+                await feed.feed(chunk)
+        stream_failed = False
     except (ConnectionError, asyncio.CancelledError):
-        pass
+        stream_failed = False
+    finally:
+        if feed is not None:
+            await feed.close(abort=stream_failed)
 
     try:
         await resp.write_eof()
@@ -794,7 +966,7 @@ async def _handle_streaming(
             request.headers,
             req_body,
             upstream_resp.status,
-            upstream_resp.headers,
+            resp_headers,
             reconstructed,
             sse_events=reassembler.events,
             upstream_base_url=upstream_base_url,
@@ -818,27 +990,15 @@ async def _handle_non_streaming(
 ) -> web.Response:
     resp_bytes = await upstream_resp.read()
     duration_ms = int((time.monotonic() - t0) * 1000)
-
-    # Decompress for JSON parsing (raw bytes are forwarded as-is to client)
-    content_encoding = upstream_resp.headers.get("Content-Encoding", "").lower()
-    decode_bytes = resp_bytes
-    if resp_bytes and content_encoding in ("gzip", "deflate"):
-        try:
-            if content_encoding == "gzip":
-                decode_bytes = gzip.decompress(resp_bytes)
-            else:
-                decode_bytes = zlib.decompress(resp_bytes)
-        except Exception:
-            pass
-
-    try:
-        resp_body = json.loads(decode_bytes) if decode_bytes else None
-    except (json.JSONDecodeError, ValueError):
-        resp_body = decode_bytes.decode("utf-8", errors="replace") if decode_bytes else None
+    resp_headers = filter_headers(upstream_resp.headers)
 
     log.info(f"{log_prefix} ← {upstream_resp.status} ({duration_ms}ms, {len(resp_bytes)} bytes)")
 
     if should_trace:
+        # The client gets the upstream bytes untouched; the decompressed copy
+        # and parsed body exist only for the trace record.
+        content_encoding = upstream_resp.headers.get("Content-Encoding", "")
+        resp_body = await _parse_response_body_for_trace(resp_bytes, content_encoding)
         record = _build_record(
             req_id,
             turn,
@@ -848,17 +1008,35 @@ async def _handle_non_streaming(
             request.headers,
             req_body,
             upstream_resp.status,
-            upstream_resp.headers,
+            resp_headers,
             resp_body,
             upstream_base_url=upstream_base_url,
         )
         await writer.write(record)
 
-    return web.Response(
-        status=upstream_resp.status,
-        headers={k: v for k, v in upstream_resp.headers.items() if k.lower() not in HOP_BY_HOP},
-        body=resp_bytes,
-    )
+    return web.Response(status=upstream_resp.status, headers=resp_headers, body=resp_bytes)
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") of the last formatted record timestamp.
+_timestamp_second: tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time, formatted like datetime.now(timezone.utc).isoformat().
+
+    The date/time prefix is formatted once per second; only the microseconds
+    change between records written within the same second.
+    """
+    global _timestamp_second
+    ns = time.time_ns()
+    second, micros = divmod(ns // 1000, 1_000_000)
+    cached_second, prefix = _timestamp_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        _timestamp_second = (second, prefix)
+    if micros:
+        return f"{prefix}.{micros:06d}+00:00"
+    return f"{prefix}+00:00"
 
 
 def _build_record(
@@ -877,7 +1055,7 @@ def _build_record(
 ) -> dict:
     """Build a trace record for a single API call."""
     record: dict = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utc_timestamp(),
         "request_id": req_id,
         "turn": turn,
         "duration_ms": duration_ms,
@@ -15,13 +15,13 @@ import time
 import urllib.error
 import urllib.request
 from contextlib import contextmanager
-from importlib.metadata import version as _pkg_version
 from pathlib import Path
 
 import aiohttp
 
 from claude_tap.process_utils import windows_no_console_subprocess_kwargs
 from claude_tap.trace_store import resolve_db_path
+from claude_tap.version import CLAUDE_TAP_VERSION
 
 DEFAULT_DASHBOARD_PORT = 19527
 _DASHBOARD_HEALTH_TIMEOUT = 1.5
@@ -30,11 +30,6 @@ _DASHBOARD_QUIT_TIMEOUT = 2.0
 _DASHBOARD_LOCK_NAME = "dashboard.lock"
 _DASHBOARD_QUIT_TOKEN_HEADER = "X-Claude-Tap-Dashboard-Token"
 
-try:
-    CLAUDE_TAP_VERSION = _pkg_version("claude-tap")
-except Exception:
-    CLAUDE_TAP_VERSION = "0.0.0"
-
 
 def resolve_dashboard_port(explicit: int | None = None) -> int:
     """Return the shared dashboard port (fixed default unless overridden)."""
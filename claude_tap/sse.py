@@ -4,9 +4,32 @@ from __future__ import annotations
 
 import copy
 import json
+from collections import deque
 
+from claude_tap.json_codec import json_loads
 from claude_tap.usage import normalize_usage
 
+# Field prefixes are matched by slicing to a fixed length and comparing, which
+# is cheaper per line than a startswith() method call.
+_EVENT_PREFIX = b"event:"
+_EVENT_PREFIX_LEN = len(_EVENT_PREFIX)
+_DATA_PREFIX = b"data:"
+_DATA_PREFIX_LEN = len(_DATA_PREFIX)
+
+# Stream events that carry nothing the snapshot needs. Skipping them up front
+# avoids walking the whole event-type dispatch chain for keep-alives and
+# bookkeeping frames.
+_NO_SNAPSHOT_EVENTS = frozenset(
+    {
+        "ping",
+        "message_stop",
+        "response.in_progress",
+        "response.content_part.added",
+        "response.content_part.done",
+        "response.output_text.done",
+    }
+)
+
 
 class SSEReassembler:
     """Parse raw SSE bytes and reconstruct the full API response object
@@ -14,73 +37,127 @@ class SSEReassembler:
 
     def __init__(self, *, store_events: bool = True):
         self._store_events = store_events
-        self.events: list[dict] = []
-        self._buf = b""
+        # Stored as (event, data) tuples while streaming; the {"event", "data"}
+        # dicts kept in trace records are only built when `events` is read.
+        self._events: list[tuple[str, object]] = []
+        # Fragments of a line that has not seen its terminating newline yet.
+        # Only joined once the newline arrives, so long lines split across many
+        # chunks are copied once instead of on every feed_bytes() call.
+        self._pending: deque[bytes] = deque()
         self._current_event: str | None = None
-        self._current_data_lines: list[str] = []
+        self._current_data_lines: list[bytes] = []
         self._snapshot: dict | None = None
+        # Text deltas are collected as string parts keyed by (slot, field) and
+        # joined into their dict at content_block_stop (or reconstruct() for
+        # truncated and non-Anthropic streams) instead of re-concatenating the
+        # whole text on every delta. Anthropic blocks use their integer block
+        # index as the slot; Chat Completions and Responses use string slots.
+        self._delta_parts: dict[tuple[int | str, str], tuple[dict, list[str]]] = {}
+        # Chat Completions reasoning key whose text the leading thinking block
+        # mirrors; synced from the message when the parts are joined.
+        self._chat_reasoning_mirror: str | None = None
+        # Set while accumulating a payload that _feed_line() parsed and did not
+        # store; nothing else references it, so the snapshot adopts its dicts
+        # instead of deep-copying them.
+        self._adopt_payloads = False
 
     def feed_bytes(self, chunk: bytes):
-        self._buf += chunk
-        while b"\n" in self._buf:
-            line, self._buf = self._buf.split(b"\n", 1)
-            self._feed_line(line.decode("utf-8", errors="replace"))
-
-    def _feed_line(self, line: str):
-        line = line.rstrip("\r")
-        if line.startswith("event:"):
-            self._current_event = line[len("event:") :].strip()
-            self._current_data_lines = []
-        elif line.startswith("data:"):
-            self._current_data_lines.append(line[len("data:") :].strip())
-        elif line == "":
+        start = 0
+        while (nl := chunk.find(b"\n", start)) >= 0:
+            if self._pending:
+                self._pending.append(chunk[start:nl])
+                line = b"".join(self._pending)
+                self._pending.clear()
+            else:
+                line = chunk[start:nl]
+            self._feed_line(line)
+            start = nl + 1
+        if start < len(chunk):
+            self._pending.append(chunk[start:] if start else chunk)
+
+    def _feed_line(self, line: bytes):
+        # Lines stay as bytes: only the event name is decoded, and the joined
+        # data payload is handed to the JSON parser without a str round-trip.
+        line = line.rstrip(b"\r")
+        if line[:_DATA_PREFIX_LEN] == _DATA_PREFIX:
+            self._current_data_lines.append(line[_DATA_PREFIX_LEN:].strip())
+        elif line[:_EVENT_PREFIX_LEN] == _EVENT_PREFIX:
+            self._current_event = line[_EVENT_PREFIX_LEN:].strip().decode("utf-8", errors="replace")
+            self._current_data_lines.clear()
+        elif not line:
             # Emit on blank line if we have an explicit event: header (Anthropic /
             # OpenAI Responses) OR accumulated data: lines without a header
             # (OpenAI Chat Completions uses bare "data: {...}" frames).
-            if self._current_event is not None or self._current_data_lines:
-                raw_data = "\n".join(self._current_data_lines)
+            data_lines = self._current_data_lines
+            if self._current_event is not None or data_lines:
+                # Nearly every event has exactly one data: line; hand that
+                # slice to the parser as-is rather than joining a copy. The
+                # list is reused across events instead of reallocated.
+                raw_data = data_lines[0] if len(data_lines) == 1 else b"\n".join(data_lines)
+                data_lines.clear()
+                event_type = self._current_event
+                self._current_event = None
                 # Skip OpenAI Chat Completions terminator "[DONE]" — it's a
                 # protocol sentinel, not a payload, and would otherwise show up
                 # as a noisy non-JSON event in the trace.
-                if raw_data == "[DONE]" and self._current_event is None:
-                    self._current_event = None
-                    self._current_data_lines = []
+                if raw_data == b"[DONE]" and event_type is None:
                     return
-                try:
-                    data = json.loads(raw_data)
-                except (json.JSONDecodeError, ValueError):
-                    data = raw_data
+                # With events not stored, nothing reads the payload of an event
+                # the snapshot ignores, so skip parsing it.
+                if event_type in _NO_SNAPSHOT_EVENTS and not self._store_events:
+                    return
+                data = _parse_data(raw_data)
                 # Default event type for bare data: frames (OpenAI Chat
                 # Completions). Snapshot reconstruction stays a no-op for
                 # these — the events themselves are preserved in the trace.
-                event_type = self._current_event or "message"
-                self.add_event(event_type, data)
-                self._current_event = None
-                self._current_data_lines = []
+                if self._store_events:
+                    self.add_event(event_type or "message", data)
+                else:
+                    # _accumulate() swallows its own errors, so the flag is
+                    # always reset.
+                    self._adopt_payloads = True
+                    self._accumulate(event_type or "message", data)
+                    self._adopt_payloads = False
 
     def add_event(self, event_type: str, data) -> None:
         """Append an already-parsed stream event and update the snapshot."""
         if self._store_events:
-            self.events.append({"event": event_type, "data": data})
+            self._events.append((event_type, data))
         self._accumulate(event_type, data)
 
+    def _own(self, value):
+        """Return value for the snapshot to keep, copying it unless adopted."""
+        return value if self._adopt_payloads else copy.deepcopy(value)
+
+    @property
+    def events(self) -> list[dict]:
+        """Stored stream events as {"event": ..., "data": ...} dicts."""
+        return [{"event": event_type, "data": data} for event_type, data in self._events]
+
     def _accumulate(self, event_type: str, data) -> None:
         """Accumulate an SSE event into the message snapshot.
 
         This replaces the anthropic SDK's accumulate_event() with a simple
         manual implementation that handles the Anthropic streaming protocol.
         """
-        if not isinstance(data, dict):
+        if event_type in _NO_SNAPSHOT_EVENTS or not isinstance(data, dict):
             return
         try:
+            if event_type == "content_block_delta":
+                # By far the most frequent Anthropic event; handle it before
+                # walking the dispatch chain below.
+                if self._snapshot is not None:
+                    self._accumulate_content_block_delta(data)
+                return
             gemini_chunk = self._gemini_chunk_payload(data) if event_type == "message" else None
 
             if event_type == "message_start":
-                self._snapshot = copy.deepcopy(data.get("message", {}))
+                self._snapshot = self._own(data.get("message", {}))
+                self._delta_parts.clear()
             elif event_type == "response.created":
                 response = data.get("response")
                 if isinstance(response, dict):
-                    self._snapshot = copy.deepcopy(response)
+                    self._snapshot = self._own(response)
             elif event_type in ("response.output_item.added", "response.output_item.done"):
                 # The Codex/ChatGPT backend streams each output item here and
                 # sends response.completed with an EMPTY output array, so the
@@ -117,7 +194,7 @@ class SSEReassembler:
             elif self._snapshot is None:
                 return
             elif event_type == "content_block_start":
-                block = copy.deepcopy(data.get("content_block", {}))
+                block = self._own(data.get("content_block", {}))
                 if "content" not in self._snapshot:
                     self._snapshot["content"] = []
                 idx = data.get("index", len(self._snapshot["content"]))
@@ -125,21 +202,10 @@ class SSEReassembler:
                 while len(self._snapshot["content"]) <= idx:
                     self._snapshot["content"].append({})
                 self._snapshot["content"][idx] = block
-            elif event_type == "content_block_delta":
-                idx = data.get("index", 0)
-                delta = data.get("delta", {})
-                block = self._content_block_for_delta(idx, delta)
-                if block is not None:
-                    if delta.get("type") == "text_delta":
-                        block["text"] = block.get("text", "") + delta.get("text", "")
-                    elif delta.get("type") == "thinking_delta":
-                        block["thinking"] = block.get("thinking", "") + delta.get("thinking", "")
-                        if delta.get("signature"):
-                            block["signature"] = delta["signature"]
-                    elif delta.get("type") == "input_json_delta":
-                        block["_partial_json"] = block.get("_partial_json", "") + delta.get("partial_json", "")
+                self._drop_delta_parts(idx)
             elif event_type == "content_block_stop":
                 idx = data.get("index", 0)
+                self._flush_delta_parts(idx)
                 if idx < len(self._snapshot.get("content", [])):
                     block = self._snapshot["content"][idx]
                     if "_partial_json" in block:
@@ -160,6 +226,48 @@ class SSEReassembler:
         except Exception:
             pass
 
+    def _accumulate_content_block_delta(self, data: dict) -> None:
+        idx = data.get("index", 0)
+        if not isinstance(idx, int) or idx < 0:
+            idx = 0
+        delta = data.get("delta", {})
+        block = self._content_block_for_delta(idx, delta)
+        if block is None:
+            return
+        delta_type = delta.get("type")
+        if delta_type == "text_delta":
+            self._append_delta_part(idx, block, "text", delta.get("text", ""))
+        elif delta_type == "thinking_delta":
+            self._append_delta_part(idx, block, "thinking", delta.get("thinking", ""))
+            if delta.get("signature"):
+                block["signature"] = delta["signature"]
+        elif delta_type == "input_json_delta":
+            self._append_delta_part(idx, block, "_partial_json", delta.get("partial_json", ""))
+
+    def _append_delta_part(self, idx: int | str, block: dict, field: str, text) -> None:
+        if not isinstance(text, str):
+            return
+        key = (idx, field)
+        pending = self._delta_parts.get(key)
+        if pending is None or pending[0] is not block:
+            pending = (block, [block.get(field) or ""])
+            self._delta_parts[key] = pending
+        pending[1].append(text)
+
+    def _flush_delta_parts(self, idx: int | None = None) -> None:
+        """Join pending delta parts into their blocks — for one block index,
+        or for every slot when idx is None."""
+        for key in [k for k in self._delta_parts if idx is None or k[0] == idx]:
+            block, parts = self._delta_parts.pop(key)
+            block[key[1]] = "".join(parts)
+        if idx is None and self._chat_reasoning_mirror is not None:
+            msg = self._snapshot["choices"][0]["message"]
+            self._mirror_reasoning_to_content(msg.get(self._chat_reasoning_mirror) or "")
+
+    def _drop_delta_parts(self, idx: int) -> None:
+        for key in [k for k in self._delta_parts if k[0] == idx]:
+            del self._delta_parts[key]
+
     def _ensure_responses_output(self) -> list:
         """Return the snapshot's OpenAI Responses `output` list, creating the
         snapshot and/or the list if a streaming output item arrives before
@@ -186,7 +294,7 @@ class SSEReassembler:
             idx = len(output)
         while len(output) <= idx:
             output.append({})
-        output[idx] = copy.deepcopy(item)
+        output[idx] = self._own(item)
 
     def _accumulate_responses_output_text(self, data: dict) -> None:
         """Append a response.output_text.delta to the in-progress message item
@@ -212,7 +320,7 @@ class SSEReassembler:
         if part is None:
             part = {"type": "output_text", "text": ""}
             content.append(part)
-        part["text"] = (part.get("text") or "") + delta
+        self._append_delta_part(f"output:{idx}", part, "text", delta)
 
     def _merge_responses_terminal(self, data: dict) -> None:
         """Apply a terminal response.completed / response.done event.
@@ -223,9 +331,9 @@ class SSEReassembler:
         already accumulated in the snapshot when the terminal one is empty."""
         response = data.get("response")
         if not isinstance(response, dict):
-            self._snapshot = copy.deepcopy(data)
+            self._snapshot = self._own(data)
             return
-        response = copy.deepcopy(response)
+        response = self._own(response)
         accumulated = self._snapshot.get("output") if isinstance(self._snapshot, dict) else None
         if not response.get("output") and isinstance(accumulated, list) and accumulated:
             response["output"] = accumulated
@@ -238,7 +346,7 @@ class SSEReassembler:
         if self._snapshot is None:
             self._snapshot = {"output": []}
         error = {k: data[k] for k in ("code", "message", "param") if k in data}
-        self._snapshot["error"] = error or copy.deepcopy(data)
+        self._snapshot["error"] = error or self._own(data)
         # The stream errored out, so promote a still-running status to failed
         # but never override a status a terminal event already set.
         if self._snapshot.get("status") in (None, "", "queued", "in_progress"):
@@ -313,15 +421,19 @@ class SSEReassembler:
             msg["role"] = delta["role"]
         reasoning_details = self._merge_chat_completion_reasoning_details(msg, delta.get("reasoning_details"))
         if reasoning_details:
+            self._chat_reasoning_mirror = None
             self._mirror_reasoning_to_content(reasoning_details)
         else:
             for reasoning_key in ("reasoning_content", "reasoning"):
                 if isinstance(delta.get(reasoning_key), str) and delta[reasoning_key]:
-                    msg[reasoning_key] = (msg.get(reasoning_key) or "") + delta[reasoning_key]
-                    self._mirror_reasoning_to_content(msg[reasoning_key])
+                    self._append_delta_part("message", msg, reasoning_key, delta[reasoning_key])
+                    # The thinking block is created now so tool_use mirrors
+                    # keep their offset; its text is synced when parts join.
+                    self._chat_completion_thinking_block(create=True)
+                    self._chat_reasoning_mirror = reasoning_key
         if isinstance(delta.get("content"), str) and delta["content"]:
-            msg["content"] = (msg.get("content") or "") + delta["content"]
-            text_block["text"] = (text_block.get("text") or "") + delta["content"]
+            self._append_delta_part("message", msg, "content", delta["content"])
+            self._append_delta_part("content", text_block, "text", delta["content"])
 
         # Tool calls arrive as indexed deltas: {"index": 0, "id":?, "type":?,
         # "function": {"name":?, "arguments":?}}. Each field accumulates by
@@ -377,7 +489,7 @@ class SSEReassembler:
         for key, value in data.items():
             if key in {"candidates", "usageMetadata"}:
                 continue
-            self._snapshot[key] = copy.deepcopy(value)
+            self._snapshot[key] = self._own(value)
 
         candidates = data.get("candidates")
         if isinstance(candidates, list):
@@ -387,7 +499,7 @@ class SSEReassembler:
 
         usage = data.get("usageMetadata")
         if isinstance(usage, dict):
-            self._snapshot["usageMetadata"] = copy.deepcopy(usage)
+            self._snapshot["usageMetadata"] = self._own(usage)
             self._snapshot["usage"] = normalize_usage(usage)
 
         self._snapshot["content"] = self._gemini_content_blocks()
@@ -410,7 +522,7 @@ class SSEReassembler:
             if key == "content" and isinstance(value, dict):
                 self._merge_gemini_candidate_content(target, value)
             else:
-                target[key] = copy.deepcopy(value)
+                target[key] = self._own(value)
 
     def _merge_gemini_candidate_content(self, candidate: dict, incoming: dict) -> None:
         content = candidate.get("content")
@@ -421,7 +533,7 @@ class SSEReassembler:
         for key, value in incoming.items():
             if key == "parts":
                 continue
-            content[key] = copy.deepcopy(value)
+            content[key] = self._own(value)
 
         parts = content.get("parts")
         if not isinstance(parts, list):
@@ -443,7 +555,7 @@ class SSEReassembler:
             ):
                 previous["text"] += part["text"]
                 return
-        parts.append(copy.deepcopy(part))
+        parts.append(self._own(part))
 
     def _is_mergeable_gemini_text_part(self, part: dict) -> bool:
         if not isinstance(part.get("text"), str):
@@ -555,7 +667,7 @@ class SSEReassembler:
                 index = fallback_index
             while len(existing) <= index:
                 existing.append({})
-            existing[index] = copy.deepcopy(detail)
+            existing[index] = self._own(detail)
 
         texts = [
             detail["text"]
@@ -572,4 +684,18 @@ class SSEReassembler:
     def reconstruct(self) -> dict | None:
         if self._snapshot is None:
             return None
+        self._flush_delta_parts()
         return self._snapshot
+
+
+def _parse_data(raw_data: bytes):
+    try:
+        return json_loads(raw_data)
+    except (json.JSONDecodeError, ValueError):
+        pass
+    text = raw_data.decode("utf-8", errors="replace")
+    try:
+        # Invalid UTF-8 inside otherwise valid JSON parses after replacement.
+        return json.loads(text)
+    except (json.JSONDecodeError, ValueError):
+        return text
@@ -7,7 +7,9 @@ import re
 import sqlite3
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import TYPE_CHECKING
 
 from claude_tap.trace_store import TraceStore, get_trace_store
@@ -16,6 +18,10 @@ from claude_tap.usage import normalize_usage
 if TYPE_CHECKING:
     from claude_tap.live import LiveViewerServer
 
+# Model list (/models, /v1/models, /v1alpha/models, /v1beta/models) and
+# single-model (/models/<id>, /v1/models/<id>) status probes.
+_MODEL_PROBE_PATH_RE = re.compile(r"/(?:(?:v1|v1alpha|v1beta)/)?models|/(?:v1/)?models/[^/:]+")
+
 
 class TraceWriter:
     """Writes trace records to the local SQLite store and accumulates statistics."""
@@ -28,7 +34,6 @@ class TraceWriter:
         store: TraceStore | None = None,
     ):
         self.session_id = session_id
-        self._lock = asyncio.Lock()
         self.count = 0
         self.total_input_tokens = 0
         self.total_output_tokens = 0
@@ -45,38 +50,58 @@ class TraceWriter:
         self.dropped_trace_records = 0
         self._startup_storage_error: sqlite3.Error | None = None
         self._storage_warning_emitted = False
+        # A single worker runs the SQLite appends so they stay in submission
+        # order without blocking the event loop on disk or lock waits.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="claude-tap-trace")
+        self._closed = False
 
     async def write(self, record: dict) -> None:
         """Write a record and update statistics."""
-        async with self._lock:
-            self._write_locked(record)
+        self._prepare_record(record)
+        await self._store_record(record)
 
         if self._live_server:
             await self._live_server.broadcast(record)
 
     async def write_next_turn(self, record: dict) -> None:
-        """Assign the next trace turn under the writer lock, then write the record."""
-        async with self._lock:
-            record["turn"] = self.count + 1
-            self._write_locked(record)
+        """Assign the next trace turn, then write the record."""
+        record["turn"] = self.count + 1
+        self._prepare_record(record)
+        await self._store_record(record)
 
         if self._live_server:
             await self._live_server.broadcast(record)
 
-    def _write_locked(self, record: dict) -> None:
+    def _prepare_record(self, record: dict) -> None:
+        # Runs on the event loop before the append is queued, so turn numbers
+        # and statistics follow call order.
         if self._metadata:
             capture = record.get("capture") if isinstance(record.get("capture"), dict) else {}
             record["capture"] = {**self._metadata, **capture}
+        self.count += 1
+        self._update_stats(record)
+
+    async def _store_record(self, record: dict) -> None:
+        if self._closed:
+            self._append_record(record)
+            return
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._append_record, record)
+
+    def _append_record(self, record: dict) -> None:
         try:
             self._store.append_record(self.session_id, record)
         except sqlite3.Error as exc:
             self.dropped_trace_records += 1
             self._record_storage_error(exc)
-        self.count += 1
-        self._update_stats(record)
 
     def close(self) -> None:
-        """Finalize the active session in SQLite."""
+        """Finish pending appends and finalize the active session in SQLite."""
+        if not self._closed:
+            self._closed = True
+            # Close the worker's thread-local connection, then wait for it. The
+            # store itself may be shared with other in-process users.
+            self._executor.submit(self._store.close_thread_connection)
+            self._executor.shutdown(wait=True)
         if self._startup_storage_error is not None:
             return
         summary = self.get_summary()
@@ -167,8 +192,11 @@ def _is_auxiliary_status_probe(record: dict) -> bool:
     path = request.get("path") if isinstance(request, dict) else ""
     if not isinstance(path, str):
         return False
+    return _is_auxiliary_status_probe_path(path)
+
+
+@lru_cache(maxsize=256)
+def _is_auxiliary_status_probe_path(path: str) -> bool:
+    # A session hits the same handful of request paths over and over.
     clean_path = path.lower().split("?", 1)[0].rstrip("/")
-    if clean_path in {"/models", "/v1/models", "/v1alpha/models", "/v1beta/models"}:
-        return True
-    match = re.fullmatch(r"/(?:v1/)?models/([^/:]+)", clean_path)
-    return match is not None
+    return _MODEL_PROBE_PATH_RE.fullmatch(clean_path) is not None
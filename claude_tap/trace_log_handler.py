@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import logging
+import queue
 import sqlite3
 from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
 from claude_tap.trace_store import TraceStore, get_trace_store
 
@@ -35,3 +37,16 @@ class SQLiteLogHandler(logging.Handler):
             return
         except Exception:
             self.handleError(record)
+
+
+def start_queued_log_handler(handler: logging.Handler) -> tuple[QueueHandler, QueueListener]:
+    """Return a handler that hands records to ``handler`` on a listener thread.
+
+    Each SQLite log append takes the trace write lock and commits, so proxy
+    code logging from the event loop only enqueues the record. Call
+    ``listener.stop()`` at shutdown to flush what is still queued.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    listener = QueueListener(log_queue, handler)
+    listener.start()
+    return QueueHandler(log_queue), listener
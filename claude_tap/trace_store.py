@@ -27,6 +27,7 @@ from claude_tap.compact_trace import (
     json_blob_payload,
     make_blob_ref,
 )
+from claude_tap.json_codec import json_dumps, json_loads
 
 DB_FILENAME = "traces.sqlite3"
 SCHEMA_VERSION = 4
@@ -94,6 +95,11 @@ class TraceStore:
         self._schema_ready = False
         self._schema_lock = threading.Lock()
         self._write_lock = threading.Lock()
+        # Kept open across writes (guarded by _write_lock) so appending a
+        # record does not reopen the lock file; reopened after fork() because
+        # flock() locks are shared by every process holding the descriptor.
+        self._write_lock_file: Any = None
+        self._write_lock_pid = 0
         self._tls = threading.local()
 
     def create_session(
@@ -221,9 +227,9 @@ class TraceStore:
                     "id": session_id,
                     "updated_at": updated_at,
                 }
-                summary_json_str = json.dumps(final_summary, ensure_ascii=False, separators=(",", ":"))
+                summary_json_str = json_dumps(final_summary)
             else:
-                summary_json_str = json.dumps(summary, ensure_ascii=False, separators=(",", ":")) if summary else None
+                summary_json_str = json_dumps(summary) if summary else None
 
             conn.execute(
                 """
@@ -386,7 +392,8 @@ class TraceStore:
                 unique_ids,
             ).fetchall()
             existing_ids = [row["id"] for row in rows]
-            missing_ids = [session_id for session_id in unique_ids if session_id not in set(existing_ids)]
+            existing_id_set = set(existing_ids)
+            missing_ids = [session_id for session_id in unique_ids if session_id not in existing_id_set]
             if not existing_ids:
                 return {
                     "deleted_sessions": 0,
@@ -575,9 +582,7 @@ class TraceStore:
 
     def export_jsonl(self, session_id: str) -> str:
         records = self.load_records(session_id)
-        return "\n".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) for record in records) + (
-            "\n" if records else ""
-        )
+        return "\n".join(json_dumps(record) for record in records) + ("\n" if records else "")
 
     def export_compact(self, session_id: str) -> str:
         records = self.load_records(session_id)
@@ -603,7 +608,7 @@ class TraceStore:
                 WHERE id = ?
                 """,
                 (
-                    json.dumps(summary, ensure_ascii=False, separators=(",", ":")),
+                    json_dumps(summary),
                     summary.get("updated_at") or datetime.now(timezone.utc).isoformat(),
                     summary.get("status") or "complete",
                     session_id,
@@ -713,6 +718,11 @@ class TraceStore:
         if protected_session_id:
             protected.add(protected_session_id)
         with self._write_access() as conn:
+            # Cleanup runs at the end of every session and usually has nothing
+            # to do; check the count before fetching and sorting every row.
+            session_count = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+            if session_count <= max_sessions:
+                return 0
             rows = conn.execute(
                 """
                 SELECT id, status, updated_at, started_at
@@ -750,14 +760,19 @@ class TraceStore:
 
         imported = 0
         legacy_source_key = _legacy_source_key(output_dir)
-        manifest_entries = _manifest_entries_by_rel_path(output_dir)
+        imported_rel_paths = self._legacy_rel_paths(legacy_source_key)
+        # Loaded on the first trace that still needs importing: once a
+        # directory has been migrated, later launches skip the manifest read.
+        manifest_entries: dict[str, dict[str, Any]] | None = None
         for trace_path in sorted(output_dir.glob("**/trace_*.jsonl")):
             rel_path = trace_path.relative_to(output_dir).as_posix()
-            if self._legacy_session_exists(legacy_source_key, rel_path):
+            if rel_path in imported_rel_paths:
                 continue
             records = _read_jsonl_file(trace_path)
             log_path = trace_path.with_suffix(".log")
             logs = _read_log_file(log_path) if log_path.is_file() else []
+            if manifest_entries is None:
+                manifest_entries = _manifest_entries_by_rel_path(output_dir)
             manifest_entry = manifest_entries.get(rel_path, {})
             session_id = self._import_legacy_session(
                 legacy_source_key=legacy_source_key,
@@ -783,8 +798,7 @@ class TraceStore:
         manifest_entry: dict[str, Any],
     ) -> str | None:
         session_id = str(uuid.uuid4())
-        stat = trace_path.stat()
-        started_at = _legacy_started_at(trace_path, records, manifest_entry, stat.st_mtime)
+        started_at = _legacy_started_at(trace_path, records, manifest_entry)
         date_key = trace_path.parent.name if _DATE_RE.match(trace_path.parent.name) else "legacy"
         client = ""
         proxy_mode = ""
@@ -867,7 +881,7 @@ class TraceStore:
                     WHERE id = ?
                     """,
                     (
-                        json.dumps(summary, ensure_ascii=False, separators=(",", ":")),
+                        json_dumps(summary),
                         summary.get("status") or "complete",
                         session_id,
                     ),
@@ -875,13 +889,14 @@ class TraceStore:
             conn.commit()
         return session_id
 
-    def _legacy_session_exists(self, legacy_source_key: str, rel_path: str) -> bool:
+    def _legacy_rel_paths(self, legacy_source_key: str) -> set[str]:
+        """Relative paths already imported from one legacy output directory."""
         with self._read_connect() as conn:
-            row = conn.execute(
-                "SELECT 1 FROM sessions WHERE legacy_source_key = ? AND legacy_rel_path = ? LIMIT 1",
-                (legacy_source_key, rel_path),
-            ).fetchone()
-        return row is not None
+            rows = conn.execute(
+                "SELECT legacy_rel_path FROM sessions WHERE legacy_source_key = ?",
+                (legacy_source_key,),
+            ).fetchall()
+        return {row[0] for row in rows}
 
     def _migration_done(self, marker: str) -> bool:
         with self._read_connect() as conn:
@@ -941,7 +956,7 @@ class TraceStore:
             WHERE id = ?
             """,
             (
-                json.dumps(summary, ensure_ascii=False, separators=(",", ":")),
+                json_dumps(summary),
                 session_id,
             ),
         )
@@ -953,6 +968,11 @@ class TraceStore:
         conn.execute("PRAGMA foreign_keys = ON")
         if enable_wal:
             conn.execute("PRAGMA journal_mode = WAL")
+            # Every record is its own commit; in WAL mode NORMAL syncs at
+            # checkpoints instead of on each commit. The database stays
+            # consistent, but commits made just before a power loss or OS
+            # crash can be lost (an application crash loses nothing).
+            conn.execute("PRAGMA synchronous = NORMAL")
         return conn
 
     def _connect(self) -> sqlite3.Connection:
@@ -980,32 +1000,49 @@ class TraceStore:
 
     @contextmanager
     def _process_write_lock(self) -> Iterator[None]:
+        lock_file = self._open_write_lock_file()
+        deadline = time.monotonic() + WRITE_LOCK_TIMEOUT_SECONDS
+        while True:
+            try:
+                _try_lock_file_exclusive(lock_file)
+                break
+            except OSError as exc:
+                if time.monotonic() >= deadline:
+                    raise sqlite3.OperationalError(f"trace write lock unavailable: {exc}") from exc
+                time.sleep(WRITE_LOCK_RETRY_SECONDS)
+        try:
+            yield
+        finally:
+            try:
+                _unlock_file(lock_file)
+            except OSError:
+                pass
+
+    def _open_write_lock_file(self) -> Any:
+        lock_file = self._write_lock_file
+        if lock_file is not None and self._write_lock_pid == os.getpid():
+            return lock_file
         try:
             lock_file = self._write_lock_path.open("a+b")
         except OSError as exc:
             raise sqlite3.OperationalError(f"trace write lock unavailable: {exc}") from exc
-
-        with lock_file:
+        try:
             lock_file.seek(0, os.SEEK_END)
             if lock_file.tell() == 0:
                 lock_file.write(b"\0")
                 lock_file.flush()
-            deadline = time.monotonic() + WRITE_LOCK_TIMEOUT_SECONDS
-            while True:
-                try:
-                    _try_lock_file_exclusive(lock_file)
-                    break
-                except OSError as exc:
-                    if time.monotonic() >= deadline:
-                        raise sqlite3.OperationalError(f"trace write lock unavailable: {exc}") from exc
-                    time.sleep(WRITE_LOCK_RETRY_SECONDS)
-            try:
-                yield
-            finally:
-                try:
-                    _unlock_file(lock_file)
-                except OSError:
-                    pass
+        except OSError as exc:
+            lock_file.close()
+            raise sqlite3.OperationalError(f"trace write lock unavailable: {exc}") from exc
+        self._write_lock_file = lock_file
+        self._write_lock_pid = os.getpid()
+        return lock_file
+
+    def _close_write_lock_file(self) -> None:
+        with self._write_lock:
+            lock_file, self._write_lock_file = self._write_lock_file, None
+            if lock_file is not None and self._write_lock_pid == os.getpid():
+                lock_file.close()
 
     @contextmanager
     def _read_connect(self) -> Iterator[sqlite3.Connection]:
@@ -1029,13 +1066,18 @@ class TraceStore:
                 finally:
                     conn.close()
 
-    def close(self) -> None:
-        """Close the thread-local SQLite connection."""
+    def close_thread_connection(self) -> None:
+        """Close the calling thread's SQLite connection, leaving shared state open."""
         conn = getattr(self._tls, "conn", None)
         if conn is not None:
             conn.close()
             self._tls.conn = None
 
+    def close(self) -> None:
+        """Close the thread-local SQLite connection and the write-lock file."""
+        self.close_thread_connection()
+        self._close_write_lock_file()
+
     def _ensure_schema_once(self, conn: sqlite3.Connection) -> None:
         with self._schema_lock:
             if self._schema_ready:
@@ -1308,8 +1350,10 @@ class TraceStore:
         return f"WHERE {' AND '.join(clauses)}", params
 
     def _encode_record(self, conn: sqlite3.Connection, session_id: str, record: dict[str, Any]) -> str:
+        # One timestamp for every blob split out of this record.
+        created_at = datetime.now(timezone.utc).isoformat()
         compact_record, refs = compact_record_blobs(
-            record, lambda value: self._store_json_blob(conn, session_id, value)
+            record, lambda value: self._store_json_blob(conn, session_id, value, created_at)
         )
         payload: dict[str, Any] = compact_record
         if refs:
@@ -1321,9 +1365,11 @@ class TraceStore:
                 },
                 "record": compact_record,
             }
-        return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        return json_dumps(payload)
 
-    def _store_json_blob(self, conn: sqlite3.Connection, session_id: str, value: Any) -> dict[str, Any] | None:
+    def _store_json_blob(
+        self, conn: sqlite3.Connection, session_id: str, value: Any, created_at: str
+    ) -> dict[str, Any] | None:
         payload_json, size_bytes, hash_value = json_blob_payload(value)
         if size_bytes < MIN_BLOB_BYTES:
             return None
@@ -1332,7 +1378,7 @@ class TraceStore:
             INSERT OR IGNORE INTO record_blobs (session_id, hash, kind, payload_json, size_bytes, created_at)
             VALUES (?, ?, ?, ?, ?, ?)
             """,
-            (session_id, hash_value, BLOB_KIND_JSON, payload_json, size_bytes, datetime.now(timezone.utc).isoformat()),
+            (session_id, hash_value, BLOB_KIND_JSON, payload_json, size_bytes, created_at),
         )
         return make_blob_ref(hash_value, size_bytes)
 
@@ -1355,7 +1401,7 @@ class TraceStore:
         payload_json: str,
         blob_cache: dict[tuple[str, str], Any],
     ) -> dict[str, Any] | None:
-        payload = json.loads(payload_json)
+        payload = json_loads(payload_json)
         return decode_compact_record_payload(
             payload,
             lambda ref: self._load_record_blob(conn, session_id, ref, blob_cache),
@@ -1377,15 +1423,20 @@ class TraceStore:
             ).fetchone()
             if row is None:
                 raise KeyError(hash_value)
-            blob_cache[cache_key] = json.loads(row["payload_json"])
+            blob_cache[cache_key] = json_loads(row["payload_json"])
         return blob_cache[cache_key]
 
 
-def _try_lock_file_exclusive(lock_file: Any) -> None:
+def _seek_to_lock_byte(lock_file: Any) -> None:
+    # msvcrt locks a byte range from the current position.
     lock_file.seek(0)
+
+
+def _try_lock_file_exclusive(lock_file: Any) -> None:
     if os.name == "nt":
         import msvcrt
 
+        _seek_to_lock_byte(lock_file)
         msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
         return
 
@@ -1395,10 +1446,10 @@ def _try_lock_file_exclusive(lock_file: Any) -> None:
 
 
 def _unlock_file(lock_file: Any) -> None:
-    lock_file.seek(0)
     if os.name == "nt":
         import msvcrt
 
+        _seek_to_lock_byte(lock_file)
         msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
         return
 
@@ -1422,7 +1473,7 @@ def _legacy_source_key(output_dir: Path) -> str:
 def _read_jsonl_file(path: Path) -> list[dict[str, Any]]:
     records: list[dict[str, Any]] = []
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        lines = path.read_bytes().splitlines()
     except OSError:
         return records
     for line in lines:
@@ -1430,8 +1481,9 @@ def _read_jsonl_file(path: Path) -> list[dict[str, Any]]:
         if not line:
             continue
         try:
-            record = json.loads(line)
-        except json.JSONDecodeError:
+            # Parsed straight from bytes; json_loads does the UTF-8 decode.
+            record = json_loads(line)
+        except ValueError:
             continue
         if isinstance(record, dict):
             records.append(record)
@@ -1448,8 +1500,8 @@ def _read_log_file(path: Path) -> list[str]:
 def _manifest_entries_by_rel_path(output_dir: Path) -> dict[str, dict[str, Any]]:
     manifest_path = output_dir / ".cloudtap-manifest.json"
     try:
-        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
+        manifest = json_loads(manifest_path.read_bytes())
+    except (OSError, ValueError):
         return {}
     if not isinstance(manifest, dict):
         return {}
@@ -1463,15 +1515,10 @@ def _manifest_entries_by_rel_path(output_dir: Path) -> dict[str, dict[str, Any]]
     return entries
 
 
-def _manifest_entry_for_rel_path(output_dir: Path, rel_path: str) -> dict[str, Any]:
-    return _manifest_entries_by_rel_path(output_dir).get(rel_path, {})
-
-
 def _legacy_started_at(
     trace_path: Path,
     records: list[dict[str, Any]],
     manifest_entry: dict[str, Any],
-    mtime: float,
 ) -> str:
     if records:
         timestamp = records[0].get("timestamp")
@@ -1480,7 +1527,8 @@ def _legacy_started_at(
     created_at = manifest_entry.get("created_at")
     if isinstance(created_at, str) and created_at:
         return created_at
-    return datetime.fromtimestamp(mtime, tz=timezone.utc).isoformat()
+    # Only traces with no records and no manifest entry need the file mtime.
+    return datetime.fromtimestamp(trace_path.stat().st_mtime, tz=timezone.utc).isoformat()
 
 
 def _parse_log_timestamp(line: str) -> str | None:
@@ -1532,7 +1580,7 @@ def _stale_active_summary_json(summary_json: object, session_id: str, status: st
     summary["id"] = session_id
     summary["status"] = status
     summary["active"] = False
-    return json.dumps(summary, ensure_ascii=False, separators=(",", ":"))
+    return json_dumps(summary)
 
 
 def _int_or_none(value: object) -> int | None:
@@ -0,0 +1,10 @@
+"""Installed claude-tap version, resolved once from package metadata."""
+
+from __future__ import annotations
+
+from importlib.metadata import version as _pkg_version
+
+try:
+    CLAUDE_TAP_VERSION = _pkg_version("claude-tap")
+except Exception:
+    CLAUDE_TAP_VERSION = "0.0.0"
@@ -5,17 +5,15 @@ from __future__ import annotations
 import base64
 import json
 import re
-from importlib.metadata import version as _pkg_version
+from collections.abc import Iterable, Iterator
+from functools import lru_cache
 from pathlib import Path
 
 from claude_tap.compact_trace import COMPACT_TRACE_MARKER, build_compact_trace_bundle, is_compact_trace_bundle
+from claude_tap.json_codec import json_dumps, json_loads
 from claude_tap.sse import SSEReassembler
 from claude_tap.usage import normalize_usage
-
-try:
-    CLAUDE_TAP_VERSION = _pkg_version("claude-tap")
-except Exception:
-    CLAUDE_TAP_VERSION = "0.0.0"
+from claude_tap.version import CLAUDE_TAP_VERSION
 
 # Threshold: traces with more entries than this use lazy mode
 LAZY_THRESHOLD = 50
@@ -40,6 +38,7 @@ VIEWER_I18N_PATH = Path(__file__).parent / "viewer_i18n.json"
 VIEWER_STYLE_TEMPLATE_ANCHOR = "<!-- CLAUDE_TAP_VIEWER_STYLE -->"
 VIEWER_SCRIPT_TEMPLATE_ANCHOR = "<!-- CLAUDE_TAP_VIEWER_SCRIPT -->"
 VIEWER_SCRIPT_ANCHOR = "<script>\nconst $ = s =>"
+_MODEL_PATH_RE = re.compile(r"/models?/([^:?/]+)")
 
 
 def _load_viewer_i18n() -> dict[str, dict[str, str]]:
@@ -55,7 +54,7 @@ def _load_viewer_i18n() -> dict[str, dict[str, str]]:
 
 
 def _viewer_i18n_script() -> str:
-    payload = json.dumps(_load_viewer_i18n(), ensure_ascii=False, separators=(",", ":"))
+    payload = json_dumps(_load_viewer_i18n())
     return f"const __CLAUDE_TAP_I18N__ = {payload};\n"
 
 
@@ -78,6 +77,17 @@ def _read_viewer_template() -> str:
     return html
 
 
+@lru_cache(maxsize=1)
+def _viewer_template_parts() -> tuple[str, str]:
+    """Return the assembled template split just before its main script.
+
+    The packaged template and assets do not change while the process runs,
+    so they are read, inlined and split once.
+    """
+    head, anchor, tail = _read_viewer_template().partition(VIEWER_SCRIPT_ANCHOR)
+    return head, anchor + tail
+
+
 def _iter_response_events(resp: dict) -> list[dict]:
     """Return stream events from SSE or WebSocket traces."""
     if not isinstance(resp, dict):
@@ -319,19 +329,23 @@ def _decode_bedrock_eventstream_events(body: object) -> list[dict]:
 def _normalize_record_for_viewer(record_json: str) -> str:
     """Normalize trace variants into the shape expected by viewer.html."""
     try:
-        record = json.loads(record_json)
+        record = json_loads(record_json)
     except (json.JSONDecodeError, TypeError):
         return record_json
-    if not isinstance(record, dict):
+    if not isinstance(record, dict) or not _normalize_record_dict_for_viewer(record):
         return record_json
+    return json_dumps(record)
+
 
+def _normalize_record_dict_for_viewer(record: dict) -> bool:
+    """Normalize an already-parsed record in place; return whether it changed."""
     response = record.get("response")
     if not isinstance(response, dict):
-        return record_json
+        return False
 
     events = _decode_bedrock_eventstream_events(response.get("body"))
     if not events:
-        return record_json
+        return False
 
     reassembler = SSEReassembler()
     for event in events:
@@ -341,8 +355,7 @@ def _normalize_record_for_viewer(record_json: str) -> str:
     if reconstructed:
         response["body"] = reconstructed
     response.setdefault("sse_events", events)
-
-    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+    return True
 
 
 def _parse_function_call_arguments(arguments: object) -> object:
@@ -413,7 +426,7 @@ def _is_gemini_request_body(body: dict) -> bool:
 def _model_from_path(path: object) -> str:
     if not isinstance(path, str):
         return ""
-    match = re.search(r"/models?/([^:?/]+)", path)
+    match = _MODEL_PATH_RE.search(path)
     return match.group(1) if match else ""
 
 
@@ -889,7 +902,7 @@ def _latest_user_text(messages: list[dict]) -> str:
 def _extract_metadata(record_json: str) -> dict | None:
     """Extract sidebar-relevant metadata from a raw JSON record string."""
     try:
-        r = json.loads(record_json)
+        r = json_loads(record_json)
     except (json.JSONDecodeError, TypeError):
         return None
     return _extract_metadata_from_record(r)
@@ -1037,76 +1050,102 @@ def _generate_html_viewer(
     *,
     display_trace_path: str | Path | None = None,
     display_html_path: str | Path | None = None,
-) -> None:
-    """Read viewer.html template, embed JSONL data, write self-contained HTML."""
-    if trace_path.exists():
-        text = trace_path.read_text(encoding="utf-8")
-        try:
-            parsed = json.loads(text)
-        except json.JSONDecodeError:
-            parsed = None
-        if is_compact_trace_bundle(parsed):
-            _generate_html_viewer_from_compact_bundle(
-                parsed,
-                html_path,
-                display_trace_path=display_trace_path if display_trace_path is not None else trace_path.absolute(),
-                display_html_path=display_html_path if display_html_path is not None else html_path.absolute(),
-            )
-            return
+) -> bool:
+    """Read viewer.html template, embed JSONL data, write self-contained HTML.
 
+    The trace is read in a single pass: a compact trace bundle is a single
+    JSON line, so only the first line is checked for one before the rest is
+    parsed as JSONL records. Returns whether the HTML file was written.
+    """
+    compact_bundle = None
     records: list[dict] = []
     if trace_path.exists():
         with open(trace_path, "r", encoding="utf-8") as f:
+            first = True
             for line in f:
                 line = line.strip()
-                if line:
-                    try:
-                        record = json.loads(_normalize_record_for_viewer(line))
-                    except json.JSONDecodeError:
-                        continue
-                    if isinstance(record, dict):
-                        records.append(record)
-    _generate_html_viewer_from_compact_bundle(
-        build_compact_trace_bundle(records),
+                if not line:
+                    continue
+                try:
+                    record = json_loads(line)
+                except json.JSONDecodeError:
+                    if first:
+                        # Possibly a pretty-printed bundle spanning many lines.
+                        compact_bundle = _load_multiline_compact_bundle(trace_path)
+                        if compact_bundle is not None:
+                            break
+                    first = False
+                    continue
+                if first and is_compact_trace_bundle(record):
+                    compact_bundle = record
+                    break
+                first = False
+                if isinstance(record, dict):
+                    _normalize_record_dict_for_viewer(record)
+                    records.append(record)
+    return _generate_html_viewer_from_compact_bundle(
+        compact_bundle if compact_bundle is not None else build_compact_trace_bundle(records),
         html_path,
         display_trace_path=display_trace_path if display_trace_path is not None else trace_path.absolute(),
         display_html_path=display_html_path if display_html_path is not None else html_path.absolute(),
     )
 
 
+def _load_multiline_compact_bundle(trace_path: Path) -> dict | None:
+    try:
+        parsed = json.loads(trace_path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+    return parsed if is_compact_trace_bundle(parsed) else None
+
+
+def _write_viewer_html(html_path: Path, data_js_parts: Iterable[str]) -> None:
+    """Write the viewer template with a data <script> injected before the main
+    script, streaming the pieces instead of building one combined string."""
+    head, tail = _viewer_template_parts()
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(head)
+        f.write("<script>\n")
+        for part in data_js_parts:
+            f.write(part)
+        f.write("</script>\n")
+        f.write(tail)
+
+
 def _generate_html_viewer_from_compact_bundle(
     compact_bundle: dict,
     html_path: Path,
     *,
     display_trace_path: str | Path,
     display_html_path: str | Path,
-) -> None:
-    """Write a self-contained HTML viewer that embeds compact trace data."""
+) -> bool:
+    """Write a self-contained HTML viewer that embeds compact trace data.
+
+    Returns False, without writing anything, when the template is missing.
+    """
     if not VIEWER_TEMPLATE_PATH.exists():
-        return
+        return False
     if not is_compact_trace_bundle(compact_bundle):
         raise ValueError(f"Expected {COMPACT_TRACE_MARKER} compact trace bundle.")
 
     trace_path_label = str(display_trace_path)
     html_path_label = str(display_html_path)
-    compact_js = json.dumps(compact_bundle, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    compact_js = json_dumps(compact_bundle).replace("</", "<\\/")
     jsonl_path_js = json.dumps(trace_path_label)
     html_path_js = json.dumps(html_path_label)
     version_js = json.dumps(CLAUDE_TAP_VERSION)
-    data_js = (
-        f"const EMBEDDED_TRACE_COMPACT_DATA = {compact_js};\n"
-        f"const __TRACE_JSONL_PATH__ = {jsonl_path_js};\n"
-        f"const __TRACE_HTML_PATH__ = {html_path_js};\n"
-        f"const __CLAUDE_TAP_VERSION__ = {version_js};\n"
-    )
-
-    html = _read_viewer_template()
-    html = html.replace(
-        VIEWER_SCRIPT_ANCHOR,
-        f"<script>\n{data_js}</script>\n{VIEWER_SCRIPT_ANCHOR}",
-        1,
+    _write_viewer_html(
+        html_path,
+        (
+            "const EMBEDDED_TRACE_COMPACT_DATA = ",
+            compact_js,
+            ";\n",
+            f"const __TRACE_JSONL_PATH__ = {jsonl_path_js};\n"
+            f"const __TRACE_HTML_PATH__ = {html_path_js};\n"
+            f"const __CLAUDE_TAP_VERSION__ = {version_js};\n",
+        ),
     )
-    html_path.write_text(html, encoding="utf-8")
+    return True
 
 
 def _generate_html_viewer_from_metadata(
@@ -1116,15 +1155,18 @@ def _generate_html_viewer_from_metadata(
     display_trace_path: str | Path,
     display_html_path: str | Path,
     records_api_path: str | Path,
-) -> None:
-    """Write an online viewer that fetches full records on demand."""
+) -> bool:
+    """Write an online viewer that fetches full records on demand.
+
+    Returns False, without writing anything, when the template is missing.
+    """
     if not VIEWER_TEMPLATE_PATH.exists():
-        return
+        return False
 
     trace_path_label = str(display_trace_path)
     html_path_label = str(display_html_path)
     records_api_label = str(records_api_path)
-    meta_js = json.dumps(metadata, ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    meta_js = json_dumps(metadata).replace("</", "<\\/")
     jsonl_path_js = json.dumps(trace_path_label)
     html_path_js = json.dumps(html_path_label)
     records_api_js = json.dumps(records_api_label)
@@ -1136,14 +1178,8 @@ def _generate_html_viewer_from_metadata(
         f"const __TRACE_RECORDS_API__ = {records_api_js};\n"
         f"const __CLAUDE_TAP_VERSION__ = {version_js};\n"
     )
-
-    html = _read_viewer_template()
-    html = html.replace(
-        VIEWER_SCRIPT_ANCHOR,
-        f"<script>\n{data_js}</script>\n{VIEWER_SCRIPT_ANCHOR}",
-        1,
-    )
-    html_path.write_text(html, encoding="utf-8")
+    _write_viewer_html(html_path, (data_js,))
+    return True
 
 
 def _generate_html_viewer_from_records(
@@ -1152,10 +1188,13 @@ def _generate_html_viewer_from_records(
     *,
     display_trace_path: str | Path,
     display_html_path: str | Path,
-) -> None:
-    """Write a self-contained HTML viewer from already-loaded JSON records."""
+) -> bool:
+    """Write a self-contained HTML viewer from already-loaded JSON records.
+
+    Returns False, without writing anything, when the template is missing.
+    """
     if not VIEWER_TEMPLATE_PATH.exists():
-        return
+        return False
 
     # Escape </ sequences so embedded record JSON cannot prematurely close the
     # surrounding <script> / <script type="text/plain"> blocks. Forward-proxy
@@ -1183,8 +1222,6 @@ def _generate_html_viewer_from_records(
 
         meta_js = json.dumps(meta_list, separators=(",", ":"))
 
-        raw_lines = "\n".join(records)
-
         data_js = (
             f"const EMBEDDED_TRACE_META = {meta_js};\n"
             f"const __TRACE_JSONL_PATH__ = {jsonl_path_js};\n"
@@ -1192,29 +1229,27 @@ def _generate_html_viewer_from_records(
             f"const __CLAUDE_TAP_VERSION__ = {version_js};\n"
         )
 
-        html = _read_viewer_template()
-        # Inject data script + raw JSONL block before the main <script> tag
-        html = html.replace(
-            VIEWER_SCRIPT_ANCHOR,
-            f"<script>\n{data_js}</script>\n"
-            f'<script type="text/plain" id="trace-raw">\n{raw_lines}\n</script>\n'
-            f"{VIEWER_SCRIPT_ANCHOR}",
-            1,
-        )
+        def data_parts() -> Iterator[str]:
+            yield data_js
+            # Close the data script and stream the raw JSONL block.
+            yield '</script>\n<script type="text/plain" id="trace-raw">\n'
+            for rec in records:
+                yield rec
+                yield "\n"
     else:
         # Small trace: inline all data as before
-        data_js = (
-            "const EMBEDDED_TRACE_DATA = [\n" + ",\n".join(records) + "\n];\n"
-            f"const __TRACE_JSONL_PATH__ = {jsonl_path_js};\n"
-            f"const __TRACE_HTML_PATH__ = {html_path_js};\n"
-            f"const __CLAUDE_TAP_VERSION__ = {version_js};\n"
-        )
-
-        html = _read_viewer_template()
-        html = html.replace(
-            VIEWER_SCRIPT_ANCHOR,
-            f"<script>\n{data_js}</script>\n{VIEWER_SCRIPT_ANCHOR}",
-            1,
-        )
+        def data_parts() -> Iterator[str]:
+            yield "const EMBEDDED_TRACE_DATA = [\n"
+            for i, rec in enumerate(records):
+                if i:
+                    yield ",\n"
+                yield rec
+            yield (
+                "\n];\n"
+                f"const __TRACE_JSONL_PATH__ = {jsonl_path_js};\n"
+                f"const __TRACE_HTML_PATH__ = {html_path_js};\n"
+                f"const __CLAUDE_TAP_VERSION__ = {version_js};\n"
+            )
 
-    html_path.write_text(html, encoding="utf-8")
+    _write_viewer_html(html_path, data_parts())
+    return True
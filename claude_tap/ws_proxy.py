@@ -8,14 +8,13 @@ import logging
 import time
 import uuid
 from collections import deque
-from datetime import datetime, timezone
 
 import aiohttp
 from aiohttp import web
 from aiohttp.helpers import get_env_proxy_for_url
 from yarl import URL
 
-from claude_tap.proxy import capture_only_response, filter_headers, is_capture_only_request
+from claude_tap.proxy import _utc_timestamp, capture_only_response, filter_headers, is_capture_only_request
 from claude_tap.trace import TraceWriter
 from claude_tap.upstream import build_upstream_url, format_upstream_error
 
@@ -405,7 +404,7 @@ def _build_ws_record(
     req_events = _parse_ws_messages(client_messages)
 
     record: dict = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": _utc_timestamp(),
         "request_id": req_id,
         "turn": turn,
         "duration_ms": duration_ms,
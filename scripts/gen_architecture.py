@@ -1,12 +1,23 @@
 #!/usr/bin/env python3
-"""Generate architecture diagram for claude-tap."""
+"""Generate architecture diagram for claude-tap.
 
-from diagrams import Cluster, Diagram, Edge
-from diagrams.generic.storage import Storage
-from diagrams.onprem.client import Client, User
-from diagrams.onprem.compute import Server
-from diagrams.programming.language import Python
-from diagrams.saas.cdn import Cloudflare
+The image is only re-rendered when this script has changed since it was last
+generated: the script's SHA-256 is recorded next to it, e.g. in
+docs/architecture.png.sha256.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+from pathlib import Path
+
+# Output path (without extension) per format. docs/architecture.svg is hand-drawn
+# artwork, so generated SVG goes next to it instead of replacing it.
+OUTPUTS = {
+    "png": "docs/architecture",
+    "svg": "docs/architecture-generated",
+}
 
 # Graph attributes for better styling
 graph_attr = {
@@ -16,6 +27,9 @@ graph_attr = {
     "splines": "ortho",
     "nodesep": "0.6",
     "ranksep": "0.8",
+    # Cap dot's network-simplex passes so layout time stays bounded as the diagram grows.
+    "nslimit": "5",
+    "nslimit1": "5",
 }
 
 node_attr = {
@@ -27,39 +41,109 @@ edge_attr = {
     "fontsize": "9",
 }
 
-with Diagram(
-    "claude-tap Architecture",
-    filename="docs/architecture",
-    outformat="png",
-    show=False,
-    direction="LR",  # Left to Right for better horizontal layout
-    graph_attr=graph_attr,
-    node_attr=node_attr,
-    edge_attr=edge_attr,
-):
-    with Cluster("User"):
-        user = User("Developer")
-
-    with Cluster("CLI Layer"):
-        claude_tap = Python("claude-tap")
-        claude_code = Client("Claude Code")
-
-    with Cluster("Proxy Layer"):
-        proxy = Server("Reverse Proxy\n(aiohttp)")
-
-    api = Cloudflare("Anthropic API")
-
-    with Cluster("Output"):
-        jsonl = Storage("trace.jsonl")
-        html = Storage("trace.html")
-        browser = Client("Live Viewer")
-
-    # Main flow
-    user >> Edge(label="run") >> claude_tap
-    claude_tap >> Edge(label="spawn") >> claude_code
-    claude_code >> Edge(label="requests") >> proxy
-    proxy >> Edge(label="forward") >> api
-    api >> Edge(label="SSE stream", style="dashed") >> proxy
-    proxy >> Edge(label="record") >> jsonl
-    jsonl >> Edge(label="generate") >> html
-    proxy >> Edge(label="broadcast", style="dotted") >> browser
+
+def _script_digest() -> str:
+    """Hash this script, which fully describes the diagram and its styling."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def build(output: str, outformat: str, dot_only: bool = False) -> None:
+    # diagrams loads graphviz and every node module it touches, so it is only
+    # imported once we know the image actually needs rendering.
+    from diagrams import Cluster, Diagram, Edge
+    from diagrams.generic.storage import Storage
+    from diagrams.onprem.client import Client, User
+    from diagrams.onprem.compute import Server
+    from diagrams.programming.language import Python
+    from diagrams.saas.cdn import Cloudflare
+
+    class DotOnlyDiagram(Diagram):
+        """Diagram that writes its Graphviz source to ``<filename>.dot`` instead of running ``dot``."""
+
+        def render(self) -> None:
+            Path(f"{self.filename}.dot").write_text(self.dot.source, encoding="utf-8")
+            # Diagram.__exit__ removes the intermediate source file render() normally leaves behind.
+            self.dot.save()
+
+    diagram_cls = DotOnlyDiagram if dot_only else Diagram
+    with diagram_cls(
+        "claude-tap Architecture",
+        filename=output,
+        outformat=outformat,
+        show=False,
+        direction="LR",  # Left to Right for better horizontal layout
+        graph_attr=graph_attr,
+        node_attr=node_attr,
+        edge_attr=edge_attr,
+    ):
+        with Cluster("User"):
+            user = User("Developer")
+
+        with Cluster("CLI Layer"):
+            claude_tap = Python("claude-tap")
+            claude_code = Client("Claude Code")
+
+        with Cluster("Proxy Layer"):
+            proxy = Server("Reverse Proxy\n(aiohttp)")
+
+        api = Cloudflare("Anthropic API")
+
+        with Cluster("Output"):
+            jsonl = Storage("trace.jsonl")
+            html = Storage("trace.html")
+            browser = Client("Live Viewer")
+
+        # Main flow
+        user >> Edge(label="run") >> claude_tap
+        claude_tap >> Edge(label="spawn") >> claude_code
+        claude_code >> Edge(label="requests") >> proxy
+        proxy >> Edge(label="forward") >> api
+        api >> Edge(label="SSE stream", style="dashed") >> proxy
+        proxy >> Edge(label="record") >> jsonl
+        jsonl >> Edge(label="generate") >> html
+        proxy >> Edge(label="broadcast", style="dotted") >> browser
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUTS),
+        default="png",
+        help="output format; SVG skips Graphviz's raster stage (default: png)",
+    )
+    parser.add_argument(
+        "--output",
+        help="output path without extension (default: docs/architecture for png, docs/architecture-generated for svg)",
+    )
+    parser.add_argument(
+        "--dot-only",
+        action="store_true",
+        help="write the Graphviz source to <output>.dot and skip rendering",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    output = args.output or OUTPUTS[args.format]
+    if args.dot_only:
+        build(output, args.format, dot_only=True)
+        print(f"Wrote {output}.dot")
+        return 0
+
+    rendered_path = Path(f"{output}.{args.format}")
+    digest_path = Path(f"{rendered_path}.sha256")
+    digest = _script_digest()
+    if rendered_path.exists() and digest_path.exists() and digest_path.read_text(encoding="utf-8").strip() == digest:
+        print(f"{rendered_path} is up to date")
+        return 0
+
+    build(output, args.format)
+    digest_path.write_text(f"{digest}\n", encoding="utf-8")
+    print(f"Wrote {rendered_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
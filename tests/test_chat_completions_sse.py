@@ -235,6 +235,22 @@ def test_chat_completions_reasoning_details_buffer_is_mirrored_as_thinking() ->
     assert snap["content"][1] == {"type": "text", "text": "Done."}
 
 
+def test_chat_completions_reconstruct_mid_stream_keeps_accumulating() -> None:
+    r = SSEReassembler(store_events=False)
+    r.feed_bytes(b'data: {"id":"c1","choices":[{"delta":{"reasoning":"Think "}}]}\n\n')
+    r.feed_bytes(b'data: {"id":"c1","choices":[{"delta":{"content":"a"}}]}\n\n')
+    assert r.reconstruct()["content"] == [{"type": "thinking", "thinking": "Think "}, {"type": "text", "text": "a"}]
+
+    r.feed_bytes(b'data: {"id":"c1","choices":[{"delta":{"reasoning":"more."}}]}\n\n')
+    for text in ("b", "c"):
+        r.feed_bytes(b'data: {"id":"c1","choices":[{"delta":{"content":"' + text.encode() + b'"}}]}\n\n')
+
+    snap = r.reconstruct()
+    assert snap["choices"][0]["message"]["reasoning"] == "Think more."
+    assert snap["choices"][0]["message"]["content"] == "abc"
+    assert snap["content"] == [{"type": "thinking", "thinking": "Think more."}, {"type": "text", "text": "abc"}]
+
+
 def test_chat_completions_tool_call_accumulation() -> None:
     """Tool calls stream as indexed deltas with name/arguments concatenated
     across multiple chunks. Final snapshot must have the assembled call."""
@@ -33,9 +33,9 @@ from claude_tap.dashboard import (
     read_dashboard_template,
 )
 from claude_tap.history import migrate_legacy_traces
-from claude_tap.live import LiveViewerServer, _record_limit_from_request
+from claude_tap.live import LIVE_CLIENT_QUEUE_SIZE, LiveViewerServer, _record_limit_from_request
 from claude_tap.trace import TraceWriter
-from claude_tap.trace_log_handler import SQLiteLogHandler
+from claude_tap.trace_log_handler import SQLiteLogHandler, start_queued_log_handler
 from claude_tap.trace_store import get_trace_store
 
 
@@ -2028,6 +2028,74 @@ async def test_dashboard_bulk_delete_skips_active_sessions(trace_db) -> None:
         await server.stop()
 
 
+@pytest.mark.asyncio
+async def test_live_viewer_broadcast_disconnects_lagging_client_instead_of_dropping_records() -> None:
+    server = LiveViewerServer(session_id="live-session")
+    lagging, keeping_up = object(), object()
+    lagging_queue: asyncio.Queue = asyncio.Queue(maxsize=LIVE_CLIENT_QUEUE_SIZE)
+    keeping_up_queue: asyncio.Queue = asyncio.Queue(maxsize=LIVE_CLIENT_QUEUE_SIZE)
+    server._sse_clients[lagging] = lagging_queue
+    server._sse_clients[keeping_up] = keeping_up_queue
+
+    for turn in range(LIVE_CLIENT_QUEUE_SIZE + 1):
+        await server.broadcast({"turn": turn})
+        while not keeping_up_queue.empty():
+            keeping_up_queue.get_nowait()
+
+    # The lagging client is told to finish instead of silently losing a record;
+    # its reconnect replays every buffered record.
+    assert lagging not in server._sse_clients
+    assert lagging_queue.get_nowait() is None
+    assert lagging_queue.empty()
+    assert keeping_up in server._sse_clients
+    replay = [json.loads(frame[len(b"data: ") :]) for frame in server._record_frames]
+    assert replay == [{"turn": turn} for turn in range(LIVE_CLIENT_QUEUE_SIZE + 1)]
+
+
+@pytest.mark.asyncio
+async def test_dashboard_broadcast_does_not_wait_on_slow_clients_and_drops_failed_ones() -> None:
+    server = LiveViewerServer(session_id="live-session")
+    release = asyncio.Event()
+    received: list[bytes] = []
+
+    class SlowClient:
+        async def write(self, data: bytes) -> None:
+            await release.wait()
+            received.append(data)
+
+    class FastClient:
+        async def write(self, data: bytes) -> None:
+            received.append(data)
+
+    class BrokenClient:
+        async def write(self, data: bytes) -> None:
+            raise ConnectionResetError
+
+    slow, fast, broken = SlowClient(), FastClient(), BrokenClient()
+    server._dashboard_clients.update({slow, fast, broken})
+    task = asyncio.create_task(server._broadcast_dashboard_event({"type": "refresh"}))
+    for _ in range(3):
+        await asyncio.sleep(0)
+    assert received == [b'event: refresh\ndata: {"type":"refresh"}\n\n']
+
+    release.set()
+    await task
+    assert len(received) == 2
+    assert server._dashboard_clients == {slow, fast}
+
+
+@pytest.mark.asyncio
+async def test_live_viewer_buffers_recent_records_but_counts_all(monkeypatch) -> None:
+    monkeypatch.setattr("claude_tap.live.LIVE_RECORD_BUFFER_SIZE", 2)
+    server = LiveViewerServer(session_id="live-session")
+    for turn in range(3):
+        await server.broadcast({"turn": turn})
+
+    assert [record["turn"] for record in server._records] == [1, 2]
+    assert list(server._record_frames) == [b'data: {"turn":1}\n\n', b'data: {"turn":2}\n\n']
+    assert await server._current_live_record_count() == 3
+
+
 def test_live_viewer_exposes_current_session_id(trace_db) -> None:
     session_id = get_trace_store().create_session(client="claude", proxy_mode="reverse")
     server = LiveViewerServer(session_id=session_id)
@@ -2049,6 +2117,23 @@ def test_sqlite_log_handler_exports_single_timestamp(trace_db) -> None:
     assert store.export_log(session_id) == "08:00:00 proxy started\n"
 
 
+def test_queued_log_handler_flushes_to_sqlite_on_stop(trace_db) -> None:
+    store = get_trace_store()
+    session_id = store.create_session(client="claude", proxy_mode="reverse")
+    queue_handler, listener = start_queued_log_handler(SQLiteLogHandler(session_id, store=store))
+    logger = logging.getLogger("claude-tap-test-queued")
+    logger.addHandler(queue_handler)
+    try:
+        for index in range(3):
+            logger.warning("line %d", index)
+    finally:
+        listener.stop()
+        logger.removeHandler(queue_handler)
+
+    messages = [line.split(" ", 1)[1] for line in store.export_log(session_id).splitlines()]
+    assert messages == ["line 0", "line 1", "line 2"]
+
+
 @pytest.mark.asyncio
 async def test_trace_writer_adds_capture_metadata(trace_db) -> None:
     store = get_trace_store()
@@ -300,6 +300,51 @@ def test_export_accepts_positional_sqlite_session_id(trace_db, tmp_path, capsys)
     assert f"Exported 1 turns to {json_path}" in capsys.readouterr().out
 
 
+def _count_normalized_records(monkeypatch) -> list[dict]:
+    from claude_tap import export
+
+    normalized: list[dict] = []
+    original_normalize = export._normalize_record_for_export
+
+    def counting_normalize(record):
+        normalized.append(record)
+        return original_normalize(record)
+
+    monkeypatch.setattr(export, "_normalize_record_for_export", counting_normalize)
+    return normalized
+
+
+@pytest.mark.parametrize("fmt", ["json", "markdown"])
+def test_export_normalizes_session_records_once(trace_db, tmp_path, monkeypatch, fmt) -> None:
+    from claude_tap.trace_store import get_trace_store
+
+    store = get_trace_store()
+    session_id = store.create_session(client="claude", proxy_mode="reverse")
+    store.append_record(
+        session_id,
+        {
+            "turn": 1,
+            "request": {"body": {"messages": [{"role": "user", "content": "hi"}]}},
+            "response": {"body": {"content": [{"type": "text", "text": "hello"}]}},
+        },
+    )
+    normalized = _count_normalized_records(monkeypatch)
+
+    assert export_main([session_id, "--format", fmt, "-o", str(tmp_path / "out")]) == 0
+    assert len(normalized) == 1
+
+
+def test_export_empty_session_id_still_normalizes_trace_file(tmp_path, monkeypatch) -> None:
+    trace_path = _write_trace(tmp_path)
+    json_path = tmp_path / "trace.json"
+    normalized = _count_normalized_records(monkeypatch)
+
+    assert export_main([str(trace_path), "--session-id", "", "--format", "json", "-o", str(json_path)]) == 0
+    assert len(normalized) == 1
+    exported = json.loads(json_path.read_text(encoding="utf-8"))
+    assert exported[0]["messages"] == [{"role": "user", "content": "hello from trace"}]
+
+
 def test_export_session_html_does_not_materialize_jsonl_file(trace_db, tmp_path, capsys, monkeypatch) -> None:
     from claude_tap.trace_store import TraceStore, get_trace_store
 
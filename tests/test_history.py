@@ -108,7 +108,7 @@ def test_migrate_legacy_directory_treats_duplicate_insert_as_already_imported(
 ) -> None:
     _write_legacy_session(tmp_path, "trace_same")
     store = get_trace_store()
-    monkeypatch.setattr(store, "_legacy_session_exists", lambda _source, _rel_path: False)
+    monkeypatch.setattr(store, "_legacy_rel_paths", lambda _source: set())
 
     assert store.migrate_legacy_directory(tmp_path) == 1
     assert store.migrate_legacy_directory(tmp_path) == 0
@@ -182,19 +182,23 @@ def test_migrate_legacy_directory_reads_manifest_once(
         ),
         encoding="utf-8",
     )
-    original_read_text = Path.read_text
+    original_read_bytes = Path.read_bytes
     manifest_reads: list[Path] = []
 
-    def counted_read_text(path: Path, *args: object, **kwargs: object) -> str:
+    def counted_read_bytes(path: Path) -> bytes:
         if path.name == ".cloudtap-manifest.json":
             manifest_reads.append(path)
-        return original_read_text(path, *args, **kwargs)
+        return original_read_bytes(path)
 
-    monkeypatch.setattr(Path, "read_text", counted_read_text)
+    monkeypatch.setattr(Path, "read_bytes", counted_read_bytes)
 
     assert migrate_legacy_traces(tmp_path) == 2
     assert len(manifest_reads) == 1
 
+    # Nothing left to import: the manifest is not read again.
+    assert migrate_legacy_traces(tmp_path) == 0
+    assert len(manifest_reads) == 1
+
 
 def test_append_log_refreshes_active_session_heartbeat(trace_db) -> None:
     store = get_trace_store()
@@ -0,0 +1,73 @@
+"""json_codec must produce the same compact JSON with and without orjson for
+ordinary trace values, and differ only in the documented ways otherwise.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import datetime
+import importlib
+import json
+import math
+import sys
+from types import ModuleType
+
+import pytest
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def codec(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> ModuleType:
+    if request.param == "orjson":
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setitem(sys.modules, "orjson", None)
+    # Import a fresh copy; monkeypatch puts the original module back afterwards.
+    package = importlib.import_module("claude_tap")
+    monkeypatch.setattr(package, "json_codec", importlib.import_module("claude_tap.json_codec"))
+    monkeypatch.delitem(sys.modules, "claude_tap.json_codec")
+    module = importlib.import_module("claude_tap.json_codec")
+    assert (module.orjson is not None) == (request.param == "orjson")
+    return module
+
+
+def test_dumps_matches_stdlib_compact_output(codec: ModuleType) -> None:
+    value = {"text": 'héllo ✓ "q" \n\x01', "n": [1, 2.5, 0.1, -3, None, True], "nested": {"k": ""}, 7: "int key"}
+    expected = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    assert codec.json_dumps(value) == expected
+    assert codec.json_dumps_bytes(value) == expected.encode("utf-8")
+
+
+def test_dumps_indented_matches_stdlib_pretty_output(codec: ModuleType) -> None:
+    value = [{"text": "héllo ✓", "n": [1, 2.5, None], "empty": {}, "none": []}]
+    assert codec.json_dumps_indented(value) == json.dumps(value, indent=2, ensure_ascii=False)
+
+
+def test_dumps_falls_back_for_values_orjson_rejects(codec: ModuleType) -> None:
+    big = 2**70
+    assert codec.json_dumps({"big": big}) == '{"big":1180591620717411303424}'
+
+
+@dataclasses.dataclass
+class _Point:
+    x: int
+
+
+@pytest.mark.parametrize("value", [datetime.datetime(2026, 1, 1), _Point(1)])
+def test_dumps_rejects_types_the_stdlib_rejects(codec: ModuleType, value: object) -> None:
+    with pytest.raises(TypeError):
+        codec.json_dumps({"v": value})
+
+
+def test_documented_float_differences(codec: ModuleType) -> None:
+    values = [math.nan, 1e-05]
+    if codec.orjson is None:
+        assert codec.json_dumps(values) == "[NaN,1e-05]"
+    else:
+        assert codec.json_dumps(values) == "[null,0.00001]"
+
+
+def test_loads_accepts_str_and_bytes(codec: ModuleType) -> None:
+    assert codec.json_loads('{"a":"✓"}') == {"a": "✓"}
+    assert codec.json_loads('{"a":"✓"}'.encode()) == {"a": "✓"}
+    assert codec.json_loads(memoryview(b'{"a":1}')) == {"a": 1}
+    assert math.isnan(codec.json_loads(b"NaN"))  # stdlib-compatible NaN literal
@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import gzip
 import json
+import zlib
 
-from claude_tap.proxy import _parse_request_body_for_trace
+from claude_tap.proxy import (
+    OFFLOAD_REQUEST_PARSE_BYTES,
+    OFFLOAD_RESPONSE_DECODE_BYTES,
+    _decode_response_body_for_trace,
+    _load_request_body_for_trace,
+    _parse_request_body_for_trace,
+    _parse_response_body_for_trace,
+)
 
 
 def test_parse_request_body_for_trace_unwraps_double_serialized_object() -> None:
@@ -31,3 +40,35 @@ def test_parse_request_body_for_trace_decodes_invalid_json_as_text() -> None:
 
 def test_parse_request_body_for_trace_empty_body_is_none() -> None:
     assert _parse_request_body_for_trace(b"") is None
+
+
+async def test_load_request_body_for_trace_matches_inline_parse_for_large_bodies() -> None:
+    body = json.dumps({"model": "m", "messages": [{"role": "user", "content": "x" * OFFLOAD_REQUEST_PARSE_BYTES}]})
+    assert await _load_request_body_for_trace(body.encode()) == json.loads(body)
+    assert await _load_request_body_for_trace(json.dumps(body).encode()) == json.loads(body)
+    assert await _load_request_body_for_trace(b"") is None
+
+
+async def test_parse_response_body_for_trace_decompresses_small_and_large_bodies() -> None:
+    small = {"id": "msg_1", "content": [{"type": "text", "text": "ok"}]}
+    large = {"id": "msg_2", "content": [{"type": "text", "text": "x" * OFFLOAD_RESPONSE_DECODE_BYTES}]}
+
+    assert await _parse_response_body_for_trace(gzip.compress(json.dumps(small).encode()), "gzip") == small
+    assert await _parse_response_body_for_trace(zlib.compress(json.dumps(small).encode()), "Deflate") == small
+    large_bytes = json.dumps(large).encode()
+    assert len(large_bytes) >= OFFLOAD_RESPONSE_DECODE_BYTES
+    assert await _parse_response_body_for_trace(large_bytes, "") == large
+
+
+async def test_parse_response_body_for_trace_keeps_undecodable_bodies_as_text() -> None:
+    assert await _parse_response_body_for_trace(b"", "gzip") is None
+    assert await _parse_response_body_for_trace(b"not gzip", "gzip") == "not gzip"
+
+
+def test_decode_response_body_for_trace_handles_multi_member_and_truncated_gzip() -> None:
+    body = json.dumps({"id": "msg_3", "content": []}).encode()
+    multi_member = gzip.compress(body[:7]) + gzip.compress(body[7:])
+    assert _decode_response_body_for_trace(multi_member, "gzip") == {"id": "msg_3", "content": []}
+
+    truncated = gzip.compress(body)[:-4]
+    assert _decode_response_body_for_trace(truncated, "gzip") == truncated.decode("utf-8", errors="replace")
@@ -0,0 +1,223 @@
+"""SSEReassembler byte-level parsing: lines split across arbitrary chunk
+boundaries must reassemble identically to a single-chunk feed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from claude_tap.sse import SSEReassembler
+
+ANTHROPIC_STREAM = (
+    b"event: message_start\n"
+    b'data: {"type":"message_start","message":{"id":"msg_1","role":"assistant","content":[]}}\n\n'
+    b"event: content_block_start\n"
+    b'data: {"type":"content_block_start","index":0,"content_block":{"type":"text","text":""}}\n\n'
+    b"event: content_block_delta\n"
+    b'data: {"type":"content_block_delta","index":0,"delta":{"type":"text_delta","text":"h\xc3\xa9llo \xe2\x9c\x93"}}\n\n'
+    b"event: content_block_stop\n"
+    b'data: {"type":"content_block_stop","index":0}\n\n'
+)
+
+
+def _feed(raw: bytes, step: int) -> SSEReassembler:
+    r = SSEReassembler()
+    for i in range(0, len(raw), step):
+        r.feed_bytes(raw[i : i + step])
+    return r
+
+
+def test_chunk_boundaries_do_not_change_result() -> None:
+    expected = _feed(ANTHROPIC_STREAM, len(ANTHROPIC_STREAM))
+    for step in (1, 2, 3, 5, 64):
+        r = _feed(ANTHROPIC_STREAM, step)
+        assert r.events == expected.events
+        assert r.reconstruct() == expected.reconstruct()
+    assert expected.reconstruct()["content"][0]["text"] == "héllo ✓"
+
+
+def test_unterminated_line_waits_for_newline() -> None:
+    r = SSEReassembler()
+    r.feed_bytes(b"event: ping\ndata: {")
+    r.feed_bytes(b'"type":')
+    assert r.events == []
+    r.feed_bytes(b'"ping"}\r\n\r\n')
+    assert r.events == [{"event": "ping", "data": {"type": "ping"}}]
+
+
+def _event(name: str, payload: str) -> bytes:
+    return f"event: {name}\ndata: {payload}\n\n".encode()
+
+
+def test_many_deltas_join_into_blocks() -> None:
+    r = SSEReassembler(store_events=False)
+    r.feed_bytes(_event("message_start", '{"type":"message_start","message":{"id":"m","content":[]}}'))
+    r.feed_bytes(_event("content_block_start", '{"index":0,"content_block":{"type":"text","text":""}}'))
+    r.feed_bytes(_event("content_block_start", '{"index":1,"content_block":{"type":"tool_use","id":"t","input":{}}}'))
+    for i in range(200):
+        r.feed_bytes(_event("content_block_delta", f'{{"index":0,"delta":{{"type":"text_delta","text":"{i},"}}}}'))
+    for part in ('{\\"a\\": ', "[1, ", "2]}"):
+        payload = f'{{"index":1,"delta":{{"type":"input_json_delta","partial_json":"{part}"}}}}'
+        r.feed_bytes(_event("content_block_delta", payload))
+    r.feed_bytes(_event("content_block_stop", '{"index":1}'))
+
+    snap = r.reconstruct()
+    assert snap["content"][1]["input"] == {"a": [1, 2]}
+    assert "_partial_json" not in snap["content"][1]
+    # Block 0 never saw content_block_stop; reconstruct() still exposes its text.
+    assert snap["content"][0]["text"] == "".join(f"{i}," for i in range(200))
+
+
+def test_reconstruct_mid_stream_keeps_accumulating() -> None:
+    r = SSEReassembler()
+    r.feed_bytes(_event("message_start", '{"type":"message_start","message":{"id":"m","content":[]}}'))
+    r.feed_bytes(_event("content_block_delta", '{"index":0,"delta":{"type":"thinking_delta","thinking":"a"}}'))
+    assert r.reconstruct()["content"][0]["thinking"] == "a"
+    r.feed_bytes(_event("content_block_delta", '{"index":0,"delta":{"type":"thinking_delta","thinking":"b"}}'))
+    r.feed_bytes(_event("content_block_stop", '{"index":0}'))
+    assert r.reconstruct()["content"][0] == {"type": "thinking", "thinking": "ab"}
+
+
+def test_data_payload_parsed_from_bytes_keeps_text_fallbacks() -> None:
+    r = SSEReassembler()
+    r.feed_bytes(b'event: delta\ndata: {"text": "bad \xff byte"}\n\n')
+    r.feed_bytes(b"event: note\ndata: plain\ndata: text\n\n")
+    assert r.events == [
+        {"event": "delta", "data": {"text": "bad � byte"}},
+        {"event": "note", "data": "plain\ntext"},
+    ]
+
+
+async def test_reassembler_feed_parses_every_chunk_before_close_returns() -> None:
+    from claude_tap.proxy import _ReassemblerFeed
+
+    r = SSEReassembler()
+    feed = _ReassemblerFeed(r)
+    for i in range(0, len(ANTHROPIC_STREAM), 7):
+        await feed.feed(ANTHROPIC_STREAM[i : i + 7])
+    await feed.close()
+    assert r.reconstruct()["content"][0]["text"] == "héllo ✓"
+    assert len(r.events) == 4
+
+
+def test_bookkeeping_events_leave_snapshot_untouched() -> None:
+    r = SSEReassembler()
+    r.feed_bytes(_event("message_start", '{"type":"message_start","message":{"id":"m","content":[]}}'))
+    before = r.reconstruct()
+    r.feed_bytes(_event("ping", '{"type":"ping"}'))
+    r.feed_bytes(_event("message_stop", '{"type":"message_stop"}'))
+    assert r.reconstruct() == before
+    assert [e["event"] for e in r.events] == ["message_start", "ping", "message_stop"]
+
+
+def test_stored_events_are_not_mutated_by_the_snapshot() -> None:
+    stream = (
+        _event("message_start", '{"type":"message_start","message":{"id":"m","content":[]}}')
+        + _event("content_block_start", '{"index":0,"content_block":{"type":"text","text":""}}')
+        + _event("content_block_delta", '{"index":0,"delta":{"type":"text_delta","text":"hi"}}')
+        + _event("content_block_stop", '{"index":0}')
+    )
+    stored = SSEReassembler()
+    stored.feed_bytes(stream)
+    unstored = SSEReassembler(store_events=False)
+    unstored.feed_bytes(stream)
+
+    assert stored.reconstruct() == unstored.reconstruct()
+    assert stored.reconstruct()["content"] == [{"type": "text", "text": "hi"}]
+    assert stored.events[0]["data"]["message"]["content"] == []
+    assert stored.events[1]["data"]["content_block"] == {"type": "text", "text": ""}
+
+
+def test_ignored_events_are_not_parsed_when_events_are_not_stored(monkeypatch) -> None:
+    from claude_tap import sse
+
+    parsed: list[bytes] = []
+    original_parse = sse._parse_data
+
+    def counting_parse(raw: bytes):
+        parsed.append(bytes(raw))
+        return original_parse(raw)
+
+    monkeypatch.setattr(sse, "_parse_data", counting_parse)
+    r = SSEReassembler(store_events=False)
+    r.feed_bytes(_event("message_start", '{"type":"message_start","message":{"id":"m","content":[]}}'))
+    r.feed_bytes(_event("ping", '{"type":"ping"}'))
+    r.feed_bytes(_event("message_stop", '{"type":"message_stop"}'))
+    assert parsed == [b'{"type":"message_start","message":{"id":"m","content":[]}}']
+    assert r.reconstruct() == {"id": "m", "content": []}
+
+
+class _FailingStreamResponse:
+    """Upstream response whose body raises after the first chunk."""
+
+    status = 200
+    reason = "OK"
+
+    def __init__(self, error: Exception) -> None:
+        from multidict import CIMultiDict
+
+        self.headers = CIMultiDict({"Content-Type": "text/event-stream"})
+        self.content = self
+        self._error = error
+
+    async def iter_chunked(self, size: int):
+        yield ANTHROPIC_STREAM[:40]
+        raise self._error
+
+
+def _pending_tasks() -> list[asyncio.Task]:
+    return [task for task in asyncio.all_tasks() if task is not asyncio.current_task() and not task.done()]
+
+
+async def test_reverse_proxy_stream_failure_does_not_leak_feed_task() -> None:
+    import aiohttp
+    from aiohttp.test_utils import make_mocked_request
+
+    from claude_tap.proxy import _handle_streaming
+
+    request = make_mocked_request("POST", "/v1/messages")
+    with pytest.raises(aiohttp.ClientPayloadError):
+        await _handle_streaming(
+            request,
+            _FailingStreamResponse(aiohttp.ClientPayloadError("truncated")),
+            "req_1",
+            1,
+            0.0,
+            {},
+            None,
+            "[test]",
+            "https://api.anthropic.com",
+            False,
+            False,
+        )
+    assert _pending_tasks() == []
+
+
+async def test_forward_proxy_stream_failure_does_not_leak_feed_task() -> None:
+    from claude_tap.forward_proxy import ForwardProxyServer
+
+    class _Writer:
+        def write(self, data: bytes) -> None:
+            pass
+
+        async def drain(self) -> None:
+            pass
+
+    server = ForwardProxyServer("127.0.0.1", 0, None, None, None)
+    with pytest.raises(TimeoutError):
+        await server._handle_streaming(
+            _FailingStreamResponse(TimeoutError()),
+            _Writer(),
+            "req_1",
+            1,
+            0.0,
+            "POST",
+            "/v1/messages",
+            {},
+            None,
+            "[test]",
+            "https://api.anthropic.com",
+        )
+    assert _pending_tasks() == []
@@ -144,6 +144,55 @@ def test_read_paths_use_short_lived_connections(tmp_path: Path) -> None:
     assert getattr(reader_store._tls, "conn", None) is None
 
 
+def test_write_connections_skip_per_commit_sync(tmp_path: Path) -> None:
+    store = TraceStore(tmp_path / "sync.sqlite3")
+    store.create_session(client="codex", proxy_mode="reverse")
+    conn = store._connect()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    store.close()
+
+
+def test_appends_reuse_the_open_write_lock_file(tmp_path: Path, monkeypatch) -> None:
+    store = TraceStore(tmp_path / "lock-reuse.sqlite3")
+    session_id = store.create_session(client="codex", proxy_mode="reverse")
+    opened: list[Path] = []
+    original_open = Path.open
+
+    def tracking_open(self: Path, *args, **kwargs):
+        if self.name.endswith(".write.lock"):
+            opened.append(self)
+        return original_open(self, *args, **kwargs)
+
+    monkeypatch.setattr(Path, "open", tracking_open)
+    for index in range(5):
+        store.append_record(session_id, _record(index))
+    assert opened == []
+
+    store.close()
+    store.append_record(session_id, _record(5))
+    assert [path.name for path in opened] == ["lock-reuse.sqlite3.write.lock"]
+    assert len(store.load_records(session_id)) == 6
+    store.close()
+
+
+async def test_trace_writer_close_leaves_shared_store_open(tmp_path: Path) -> None:
+    store = TraceStore(tmp_path / "shared.sqlite3")
+    session_id = store.create_session(client="codex", proxy_mode="reverse")
+    writer = TraceWriter(session_id, store=store)
+    await writer.write(_record(0))
+    lock_file = store._write_lock_file
+
+    writer.close()
+
+    assert lock_file is not None and not lock_file.closed
+    assert store._write_lock_file is lock_file
+    store.append_record(session_id, _record(1))
+    assert len(store.load_records(session_id)) == 2
+    store.close()
+    assert lock_file.closed
+
+
 def test_failed_write_rolls_back_quickly(tmp_path: Path) -> None:
     db_path = tmp_path / "rollback.sqlite3"
     store = TraceStore(db_path)
@@ -174,7 +223,8 @@ async def test_trace_writer_drops_locked_record_without_interrupting_capture(tmp
     writer = TraceWriter(session_id, store=store)
     await writer.write(_record(1))
 
-    store._connect().execute("PRAGMA busy_timeout = 50")
+    # Appends run on the writer's worker thread, which owns its own connection.
+    writer._executor.submit(lambda: store._connect().execute("PRAGMA busy_timeout = 50")).result()
     locker = _hold_sqlite_write_lock(db_path)
     try:
         await writer.write(_record(2))
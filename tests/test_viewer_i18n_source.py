@@ -2,7 +2,14 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from claude_tap.viewer import VIEWER_JS_PATHS, _generate_html_viewer, _load_viewer_i18n, _read_viewer_template
+from claude_tap.viewer import (
+    VIEWER_JS_PATHS,
+    VIEWER_SCRIPT_ANCHOR,
+    _generate_html_viewer,
+    _load_viewer_i18n,
+    _read_viewer_template,
+    _viewer_template_parts,
+)
 
 EXPECTED_LANGUAGES = ["en", "zh-CN", "ja", "ko", "fr", "ar", "de", "ru"]
 CRITICAL_KEYS = [
@@ -50,6 +57,15 @@ def test_read_viewer_template_embeds_i18n_before_main_script() -> None:
     assert "viewer_assets" not in html
 
 
+def test_viewer_template_parts_split_before_main_script() -> None:
+    head, tail = _viewer_template_parts()
+
+    assert head + tail == _read_viewer_template()
+    assert tail.startswith(VIEWER_SCRIPT_ANCHOR)
+    assert VIEWER_SCRIPT_ANCHOR not in head
+    assert _viewer_template_parts() is _viewer_template_parts()
+
+
 def test_read_viewer_template_embeds_split_js_assets_in_order() -> None:
     html = _read_viewer_template()
 
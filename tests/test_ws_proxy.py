@@ -6,7 +6,9 @@ import os
 import shutil
 import tempfile
 import tracemalloc
+from datetime import datetime, timezone
 from pathlib import Path
+from types import SimpleNamespace
 
 import aiohttp
 import pytest
@@ -1208,6 +1210,52 @@ def test_build_ws_record_treats_empty_error_string_as_failure() -> None:
     assert record["response"]["error"] == ""
 
 
+def test_build_ws_record_timestamp_formats_each_second_once(monkeypatch) -> None:
+    from claude_tap import proxy
+
+    second = int(datetime(2026, 5, 24, 10, 0, 0, tzinfo=timezone.utc).timestamp())
+    clock = iter(
+        [
+            second * 1_000_000_000 + 123_456_789,
+            second * 1_000_000_000 + 500_000_000,
+            (second + 1) * 1_000_000_000,
+        ]
+    )
+    formatted: list[int] = []
+
+    class CountingDatetime(datetime):
+        @classmethod
+        def fromtimestamp(cls, t, tz=None):
+            formatted.append(t)
+            return datetime.fromtimestamp(t, tz)
+
+    monkeypatch.setattr(proxy, "time", SimpleNamespace(time_ns=lambda: next(clock)))
+    monkeypatch.setattr(proxy, "datetime", CountingDatetime)
+    monkeypatch.setattr(proxy, "_timestamp_second", (-1, ""))
+
+    stamps = [
+        _build_ws_record(
+            req_id=f"req_{i}",
+            turn=i,
+            duration_ms=1,
+            path_qs="/v1/responses",
+            req_headers={},
+            client_messages=[],
+            server_messages=[],
+            upstream_base_url="",
+        )["timestamp"]
+        for i in range(3)
+    ]
+
+    assert stamps == [
+        "2026-05-24T10:00:00.123456+00:00",
+        "2026-05-24T10:00:00.500000+00:00",
+        "2026-05-24T10:00:01+00:00",
+    ]
+    assert stamps[2] == datetime(2026, 5, 24, 10, 0, 1, tzinfo=timezone.utc).isoformat()
+    assert formatted == [second, second + 1]
+
+
 # ---------------------------------------------------------------------------
 # Test 4: WebSocket coexists with HTTP — mixed traffic
 # ---------------------------------------------------------------------------